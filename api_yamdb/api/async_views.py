@@ -0,0 +1,55 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponseNotAllowed
+from rest_framework.permissions import SAFE_METHODS
+
+from api.views import (
+    CategoryViewSet,
+    CommentsViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+)
+from core.db.health import check_connections, mark_connections_used
+
+
+def read_only(viewset, actions):
+    """Асинхронная обёртка над чтением из синхронного вьюсета.
+
+    В Django 3.2 нет асинхронного ORM, поэтому вьюсет целиком выполняется
+    в пуле потоков, а цикл событий тем временем обслуживает другие
+    соединения. Кэш, условные запросы, фильтры и пагинация остаются теми же,
+    что у синхронных эндпоинтов.
+    """
+    view = viewset.as_view(actions)
+
+    def respond(request, *args, **kwargs):
+        # Соединения потоков пула не видят request_started/finished.
+        close_old_connections()
+        check_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            return response.render()
+        finally:
+            mark_connections_used()
+            close_old_connections()
+
+    async def async_view(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return HttpResponseNotAllowed(SAFE_METHODS)
+        return await sync_to_async(respond, thread_sensitive=False)(
+            request, *args, **kwargs
+        )
+
+    async_view.csrf_exempt = True
+    return async_view
+
+
+title_list = read_only(TitleViewSet, {'get': 'list'})
+title_detail = read_only(TitleViewSet, {'get': 'retrieve'})
+genre_list = read_only(GenreViewSet, {'get': 'list'})
+category_list = read_only(CategoryViewSet, {'get': 'list'})
+review_list = read_only(ReviewViewSet, {'get': 'list'})
+review_detail = read_only(ReviewViewSet, {'get': 'retrieve'})
+comment_list = read_only(CommentsViewSet, {'get': 'list'})
+comment_detail = read_only(CommentsViewSet, {'get': 'retrieve'})
@@ -0,0 +1,30 @@
+from django.db.models import Count
+
+from reviews.models import GenreTitle
+
+
+def get_facets(queryset):
+    """Количество тайтлов выборки по жанрам, категориям и годам.
+
+    Каждый фасет — один запрос с GROUP BY; жанры считаются по GenreTitle
+    тайтлов выборки, и отфильтрованные id не загружаются в Python.
+    """
+    queryset = queryset.order_by()
+    return {
+        'genre': dict(
+            GenreTitle.objects.filter(title__in=queryset.values('pk'))
+            .values('genre__slug')
+            .annotate(count=Count('title_id'))
+            .values_list('genre__slug', 'count')
+        ),
+        'category': dict(
+            queryset.values('category__slug')
+            .annotate(count=Count('pk'))
+            .values_list('category__slug', 'count')
+        ),
+        'year': dict(
+            queryset.values('year')
+            .annotate(count=Count('pk'))
+            .values_list('year', 'count')
+        ),
+    }
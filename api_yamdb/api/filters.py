@@ -1,29 +1,57 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import GenreTitle, Title
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
-    category = filters.CharFilter(
-        field_name='category__slug', lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='icontains'
+    category = CharInFilter(field_name='category__slug', lookup_expr='in')
+    genre = CharInFilter(method='filter_genre')
+    genre_mode = filters.ChoiceFilter(
+        choices=(('any', 'any'), ('all', 'all')),
+        method='filter_genre_mode',
     )
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains',
     )
-    year = filters.NumberFilter(
-        field_name='year',
-        lookup_expr='icontains',
-    )
+    year = filters.NumberFilter(field_name='year')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = (
             'category',
             'genre',
+            'genre_mode',
             'name',
             'year',
+            'year_min',
+            'year_max',
+            'search',
         )
+
+    def filter_genre(self, queryset, name, value):
+        """Тайтлы с любым из жанров или, при genre_mode=all, со всеми."""
+        memberships = GenreTitle.objects.filter(title=OuterRef('pk'))
+        if self.form.cleaned_data.get('genre_mode') == 'all':
+            for slug in value:
+                queryset = queryset.filter(
+                    Exists(memberships.filter(genre__slug=slug))
+                )
+            return queryset
+        return queryset.filter(
+            Exists(memberships.filter(genre__slug__in=value))
+        )
+
+    def filter_genre_mode(self, queryset, name, value):
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return queryset.search(value)
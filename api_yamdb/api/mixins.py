@@ -1,4 +1,19 @@
+import hashlib
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import mixins
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from core.cache import get_modified, get_version
+from core.db.routers import may_be_stale
+from core.metrics import RESPONSE_CACHE
+from reviews.models import Review, Title
 
 
 class ListCreateDestroyMixin(
@@ -7,3 +22,144 @@ class ListCreateDestroyMixin(
     mixins.DestroyModelMixin,
 ):
     pass
+
+
+class NestedResourceMixin:
+    """Родительские объекты из URL, загруженные один раз за запрос.
+
+    Отзыв грузится вместе с произведением одним запросом и только если
+    относится к `title_id` из URL.
+    """
+
+    @cached_property
+    def title(self):
+        if 'review_id' in self.kwargs:
+            return self.review.title
+        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review.objects.select_related('title'),
+            pk=self.kwargs['review_id'],
+            title_id=self.kwargs['title_id'],
+        )
+
+
+def get_request_digest(request, *parts):
+    return hashlib.md5(
+        repr((
+            *parts,
+            request.path,
+            sorted(request.query_params.lists()),
+            request.accepted_renderer.format,
+        )).encode()
+    ).hexdigest()
+
+
+class SparseFieldsetMixin:
+    """Урезает запрос к базе под ?fields= и ?expand= сериализатора.
+
+    sparse_required_fields — поля модели, которые нужны вьюсету помимо
+    полей ответа (связь с родителем, поле сортировки курсора).
+    """
+
+    sparse_required_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not (
+            'fields' in params or 'expand' in params
+        ):
+            return queryset
+        serializer = self.get_serializer()
+        if not hasattr(serializer, 'prune_queryset'):
+            return queryset
+        return serializer.prune_queryset(
+            queryset, self.sparse_required_fields
+        )
+
+
+class CachedResponseMixin:
+    """Кэширует данные ответов до смены версии области cache_scope.
+
+    Ответ реплики, которая может отставать от свежей версии, не кэшируется.
+    """
+
+    cache_scope = 'catalog'
+
+    def get_response_cache_key(self, request, version):
+        digest = get_request_digest(request)
+        return f'response:{self.cache_scope}:{version}:{digest}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        version = get_version(self.cache_scope)
+        key = self.get_response_cache_key(request, version)
+        data = cache.get(key)
+        if data is not None:
+            RESPONSE_CACHE.labels('hit').inc()
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        RESPONSE_CACHE.labels('miss').inc()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not may_be_stale(version):
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalResponseMixin:
+    """ETag и Last-Modified по версиям областей get_condition_scopes().
+
+    Ответ 304 отдаётся до выполнения запроса к списку. Ответ реплики,
+    которая может отставать от свежей версии, отдаётся без них.
+    """
+
+    def get_condition_scopes(self):
+        raise NotImplementedError
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        versions = [
+            get_version(scope) for scope in self.get_condition_scopes()
+        ]
+        etag = quote_etag(get_request_digest(request, versions))
+        last_modified = get_modified(max(versions))
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304) and not may_be_stale(
+            max(versions)
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,77 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+
+
+class IdCursorPagination(CursorPagination):
+    ordering = 'id'
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ('pub_date', 'id')
+
+
+class LeaderboardPagination(CursorPagination):
+    ordering = ('-score', 'title_id')
+
+
+class OptionalCursorPagination(BasePagination):
+    """Обычная пагинация или пагинация по курсору при ?pagination=cursor.
+
+    Курсорный режим не выполняет COUNT(*) и не использует OFFSET,
+    ссылки next/previous сохраняют выбранный режим.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    default_class = PageNumberPagination
+    cursor_class = None
+
+    def __init__(self):
+        self.paginator = self.default_class()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode == self.cursor_mode:
+            self.paginator = self.cursor_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_fields(self, view):
+        return [
+            *self.default_class().get_schema_fields(view),
+            *self.cursor_class().get_schema_fields(view),
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.default_class().get_schema_operation_parameters(view),
+            *self.cursor_class().get_schema_operation_parameters(view),
+        ]
+
+
+class TitlePagination(OptionalCursorPagination):
+    default_class = LimitOffsetPagination
+    cursor_class = IdCursorPagination
+
+
+class PubDatePagination(OptionalCursorPagination):
+    cursor_class = PubDateCursorPagination
@@ -33,7 +33,7 @@ class ContentPermission(IsAdminOrReadOnly):
                 request.user.role
                 in (User.UserRole.ADMIN, User.UserRole.MODERATOR)
                 or request.user.is_superuser
-                or obj.author == request.user
+                or obj.author_id == request.user.pk
             )
             or request.method in SAFE_METHODS
         )
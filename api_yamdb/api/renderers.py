@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson.
+
+    Без orjson и для запросов с отступом (`Accept: application/json;
+    indent=4`) работает как обычный JSONRenderer. Даты и время orjson
+    сериализует сам, остальные типы (Decimal, ленивые строки) — через
+    JSONEncoder из DRF.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z if orjson else 0
+    default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=self.default, option=self.options)
+        # Как и JSONRenderer, экранирует разделители строк для JSONP.
+        return ret.replace(LINE_SEPARATOR, b'\\u2028').replace(
+            PARAGRAPH_SEPARATOR, b'\\u2029'
+        )
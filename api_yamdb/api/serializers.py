@@ -1,12 +1,135 @@
 import re
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils import timezone
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
-from rest_framework.relations import SlugRelatedField
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import (
+    ManyRelatedField,
+    PrimaryKeyRelatedField,
+    SlugRelatedField,
+)
+from rest_framework.settings import api_settings
 
+from core.cache import bump_version
+from core.profiling import timed
+from reviews import leaderboards
 from users.models import User
-from reviews.models import Category, Comment, Genre, Title, Review
+from reviews.models import Category, Comment, Genre, GenreTitle, Title, Review
+
+
+def get_query_list(request, name):
+    """Список имён через запятую из параметра запроса или None."""
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def get_related_sources(field):
+    """Поля связанной модели, которые читает поле сериализатора."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, ManyRelatedField):
+        field = field.child_relation
+    if isinstance(field, serializers.Serializer):
+        return [child.source for child in field.fields.values()]
+    if isinstance(field, SlugRelatedField):
+        return [field.slug_field]
+    if isinstance(field, PrimaryKeyRelatedField):
+        return []
+    return None
+
+
+class TimedSerializerMixin:
+    """Время представления ответа идёт в раздел serialize профиля запроса.
+
+    Замеряется только корневой сериализатор (или элементы корневого
+    списка), поэтому вложенные сериализаторы не учитываются дважды.
+    """
+
+    def is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def to_representation(self, instance):
+        if not self.is_root():
+            return super().to_representation(instance)
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+
+class SparseFieldsetSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    """Поля ответа по ?fields= и раскрытие связей по ?expand=.
+
+    `?fields=id,name` оставляет в ответе только эти поля, `?expand=author`
+    заменяет поле из Meta.expandable_fields вложенным объектом. Действует
+    на чтение и только у корневого сериализатора. Поля модели, из которых
+    берутся вычисляемые поля, перечисляются в Meta.field_sources.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not (
+            request and request.method in SAFE_METHODS and self.is_root()
+        ):
+            return fields
+        names = get_query_list(request, 'fields')
+        if names is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in names
+            }
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in get_query_list(request, 'expand') or ():
+            if name in fields and name in expandable:
+                fields[name] = expandable[name](read_only=True)
+        return fields
+
+    def prune_queryset(self, queryset, required=()):
+        """Загружает из базы только поля, нужные ответу.
+
+        Для полей, которые не удаётся сопоставить с моделью, запрос
+        остаётся прежним.
+        """
+        only, select, prefetch = list(required), [], []
+        sources = getattr(self.Meta, 'field_sources', {})
+        opts = self.Meta.model._meta
+        for name, field in self.fields.items():
+            if name in sources:
+                only.extend(sources[name])
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                return queryset
+            if not model_field.is_relation:
+                only.append(field.source)
+                continue
+            related = get_related_sources(field)
+            if related is None or model_field.one_to_many:
+                return queryset
+            if model_field.many_to_many:
+                prefetch.append(Prefetch(
+                    field.source,
+                    model_field.related_model.objects.only(*related),
+                ))
+                continue
+            only.append(field.source)
+            if related:
+                select.append(field.source)
+                only.extend(f'{field.source}__{item}' for item in related)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            # Без аргументов select_related() следует по всем связям.
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch).only(*only)
 
 
 class UserSignupSerializer(serializers.ModelSerializer):
@@ -55,7 +178,7 @@ class UserSignupSerializer(serializers.ModelSerializer):
         )[0]
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetSerializer):
     class Meta:
         fields = (
             'username',
@@ -93,7 +216,18 @@ class UserSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class AuthorSerializer(serializers.ModelSerializer):
+    class Meta:
+        fields = (
+            'username',
+            'first_name',
+            'last_name',
+            'bio',
+        )
+        model = User
+
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'name',
@@ -102,7 +236,7 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         fields = (
             'name',
@@ -111,7 +245,7 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializer):
     author = SlugRelatedField(slug_field='username', read_only=True)
 
     class Meta:
@@ -123,26 +257,30 @@ class ReviewSerializer(serializers.ModelSerializer):
             'pub_date',
         )
         model = Review
+        expandable_fields = {'author': AuthorSerializer}
         read_only_fields = (
             'title',
             'pub_date',
         )
 
-    def validate(self, attrs):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs['title_id']
-        title = get_object_or_404(Title, pk=title_id)
-        if (
-            request.method == 'POST'
-            and Review.objects.filter(title=title, author=author).exists()
-        ):
-            raise serializers.ValidationError('Review already exists')
-
-        return attrs
+    def create(self, validated_data):
+        try:
+            return super().create(validated_data)
+        except IntegrityError as exc:
+            # Review.save откатывается к своей точке сохранения, поэтому
+            # после ошибки база доступна. Остальные нарушения целостности
+            # (например, тайтл удалён параллельно) — не повторный отзыв.
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author'],
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ['Review already exists']
+            }) from exc
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsetSerializer):
     rating = serializers.IntegerField(read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
@@ -158,6 +296,14 @@ class TitleSerializer(serializers.ModelSerializer):
             'category',
         )
         model = Title
+        field_sources = {'rating': ('rating_sum', 'rating_count')}
+
+
+class TopTitleSerializer(TitleSerializer):
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(TitleSerializer.Meta):
+        fields = (*TitleSerializer.Meta.fields, 'score')
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -191,7 +337,92 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return value
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class PreloadedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который берёт объекты из context['slugs'].
+
+    Объекты всех слагов пакета загружаются заранее, поэтому проверка
+    элемента не обращается к базе.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        try:
+            return self.context['slugs'][self.queryset.model][data]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=data
+            )
+
+
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """Создаёт тайтлы пакета и их жанры через bulk_create в одной транзакции.
+
+    На базах, которые не возвращают id из bulk_create (SQLite), тайтлы
+    сохраняются по одному.
+    """
+
+    @staticmethod
+    def load_slugs(data):
+        """Одним запросом на модель загружает жанры и категории пакета."""
+        items = [item for item in data if isinstance(item, dict)]
+        genres = {
+            slug
+            for item in items
+            if isinstance(item.get('genre'), list)
+            for slug in item['genre']
+            if isinstance(slug, str)
+        }
+        categories = {
+            item['category']
+            for item in items
+            if isinstance(item.get('category'), str)
+        }
+        return {
+            Genre: Genre.objects.in_bulk(genres, field_name='slug'),
+            Category: Category.objects.in_bulk(categories, field_name='slug'),
+        }
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                name: value for name, value in item.items() if name != 'genre'
+            })
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Title.objects.bulk_create(titles)
+            else:
+                for title in titles:
+                    title.save(force_insert=True)
+            GenreTitle.objects.bulk_create([
+                GenreTitle(title=title, genre=genre)
+                for title, item in zip(titles, validated_data)
+                for genre in dict.fromkeys(item['genre'])
+            ])
+            leaderboards.sync_titles([title.pk for title in titles])
+        bump_version('catalog')
+        prefetch_related_objects(titles, 'genre')
+        return titles
+
+
+class TitleBulkSerializer(TitleWriteSerializer):
+    genre = PreloadedSlugRelatedField(
+        slug_field='slug',
+        queryset=Genre.objects.all(),
+        many=True,
+    )
+    category = PreloadedSlugRelatedField(
+        slug_field='slug',
+        queryset=Category.objects.all(),
+    )
+
+    class Meta(TitleWriteSerializer.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
+
+class CommentSerializer(SparseFieldsetSerializer):
     author = SlugRelatedField(read_only=True, slug_field='username')
 
     class Meta:
@@ -202,3 +433,4 @@ class CommentSerializer(serializers.ModelSerializer):
             'pub_date',
         )
         model = Comment
+        expandable_fields = {'author': AuthorSerializer}
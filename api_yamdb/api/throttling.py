@@ -0,0 +1,44 @@
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+from core.throttling import take_token
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Токен-бакет на действие вьюсета.
+
+    Лимит берётся из THROTTLE_RATES по ключу `<действие>.<kind>` в формате
+    DRF (`5/minute`): бакет вмещает 5 запросов и наполняется за минуту.
+    Без лимита для действия запросы не ограничиваются.
+    """
+
+    kind = None
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        rate = settings.THROTTLE_RATES.get(f'{view.action}.{self.kind}')
+        ident = self.get_ident(request)
+        if not rate or ident is None:
+            return True
+        capacity, duration = SimpleRateThrottle.parse_rate(None, rate)
+        self.wait_time = take_token(
+            f'{view.action}:{self.kind}:{ident}', capacity, capacity / duration
+        )
+        return self.wait_time is None
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    kind = 'username'
+
+    def get_ident(self, request):
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import async_views, views
 
 app_name = 'api'
 
@@ -46,7 +46,53 @@ router.register(
     views.ReviewViewSet,
     basename='reviews',
 )
+router.register(
+    'cache',
+    views.CacheViewSet,
+    basename='cache',
+)
+router.register(
+    'db',
+    views.DatabaseViewSet,
+    basename='db',
+)
+
+async_urlpatterns = [
+    path('titles/', async_views.title_list, name='async-titles-list'),
+    path(
+        'titles/<int:pk>/',
+        async_views.title_detail,
+        name='async-titles-detail',
+    ),
+    path('genres/', async_views.genre_list, name='async-genres-list'),
+    path(
+        'categories/',
+        async_views.category_list,
+        name='async-categories-list',
+    ),
+    path(
+        'titles/<int:title_id>/reviews/',
+        async_views.review_list,
+        name='async-reviews-list',
+    ),
+    path(
+        'titles/<int:title_id>/reviews/<int:pk>/',
+        async_views.review_detail,
+        name='async-reviews-detail',
+    ),
+    path(
+        'titles/<int:title_id>/reviews/<int:review_id>/comments/',
+        async_views.comment_list,
+        name='async-comments-list',
+    ),
+    path(
+        'titles/<int:title_id>/reviews/<int:review_id>/comments/<int:pk>/',
+        async_views.comment_detail,
+        name='async-comments-detail',
+    ),
+]
 
 urlpatterns = [
+    path('v1/async/', include(async_urlpatterns)),
     path('v1/', include(router.urls)),
 ]
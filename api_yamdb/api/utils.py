@@ -1,5 +1,4 @@
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import EmailMessage
 
 
 class ConfirmationCodeGenerator(PasswordResetTokenGenerator):
@@ -16,7 +15,3 @@ class ConfirmationCodeGenerator(PasswordResetTokenGenerator):
 
 
 code_generator = ConfirmationCodeGenerator()
-
-
-def send_mail(subject, body, to: list[str]):
-    EmailMessage(subject, body, to=to).send()
@@ -1,34 +1,57 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.db import connections
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
+from api.facets import get_facets
 from api.filters import TitleFilter
-from api.mixins import ListCreateDestroyMixin
+from api.mixins import (
+    CachedListMixin,
+    CachedRetrieveMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ListCreateDestroyMixin,
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+)
+from api.pagination import (
+    LeaderboardPagination,
+    PubDatePagination,
+    TitlePagination,
+)
 from api.permissions import ContentPermission, IsAdmin, IsAdminOrReadOnly
 from api.serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
+    TitleBulkListSerializer,
+    TitleBulkSerializer,
     TitleSerializer,
     TitleWriteSerializer,
+    TopTitleSerializer,
     UserSerializer,
     UserSignupSerializer,
 )
-from api.utils import code_generator, send_mail
-from reviews.models import Category, Genre, Review, Title, User
+from api.throttling import IPThrottle, UsernameThrottle
+from api.utils import code_generator
+from core.db.pool import get_pool_stats
+from core.mail import enqueue_mail
+from core.metrics import get_response_cache_counts
+from reviews import leaderboards
+from reviews.models import Category, Genre, Title, User
 
 
 class AuthViewSet(viewsets.GenericViewSet):
     queryset = User.objects.all()
     serializer_class = UserSignupSerializer
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (IPThrottle, UsernameThrottle)
 
     @action(detail=False, methods=['post'], url_path='signup')
     def signup(self, request, *args, **kwargs):
@@ -36,7 +59,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer.is_valid(raise_exception=True)
         user = self.perform_create(serializer)
         confirmation_code = code_generator.make_code(user)
-        send_mail(
+        enqueue_mail(
             'Confirm your email',
             (
                 f'Confirm your email to obtain personal access token. '
@@ -84,9 +107,20 @@ class AuthViewSet(viewsets.GenericViewSet):
         )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).all()
-    pagination_class = LimitOffsetPagination
+class TitleViewSet(
+    SparseFieldsetMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = (
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
+        .defer('search_vector')
+    )
+    pagination_class = TitlePagination
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
@@ -103,10 +137,101 @@ class TitleViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ('create', 'partial_update'):
             return TitleWriteSerializer
+        if self.action == 'bulk':
+            return TitleBulkSerializer
         return TitleSerializer
 
+    def get_condition_scopes(self):
+        return ('catalog',)
+
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request, *args, **kwargs):
+        """Лучшие тайтлы: все или одного жанра, категории или года."""
+        params = {
+            name: request.query_params[name]
+            for name in ('genre', 'category', 'year')
+            if name in request.query_params
+        }
+        if len(params) > 1:
+            return Response(
+                {'detail': 'Use at most one of genre, category and year'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        board = leaderboards.get_board()
+        if 'year' in params:
+            if not params['year'].isdigit():
+                return Response(
+                    {'year': 'must be a number'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            board = leaderboards.get_board('year', int(params['year']))
+        for name, model in (('genre', Genre), ('category', Category)):
+            if name in params:
+                board = leaderboards.get_board(
+                    name, get_object_or_404(model, slug=params[name]).pk
+                )
+
+        paginator = LeaderboardPagination()
+        entries = paginator.paginate_queryset(
+            leaderboards.get_top(board)
+            .select_related('title__category')
+            .prefetch_related('title__genre'),
+            request,
+            view=self,
+        )
+        titles = []
+        for entry in entries:
+            entry.title.score = entry.score
+            titles.append(entry.title)
+        serializer = TopTitleSerializer(
+            titles, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        permission_classes=(IsAdmin,),
+    )
+    def bulk(self, request, *args, **kwargs):
+        """Создаёт список тайтлов целиком или возвращает ошибки элементов."""
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Expected a list of titles'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(request.data) > settings.TITLES_BULK_MAX_SIZE:
+            return Response(
+                {
+                    'detail': f'No more than {settings.TITLES_BULK_MAX_SIZE} '
+                    f'titles per request'
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                'slugs': TitleBulkListSerializer.load_slugs(request.data),
+            },
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.request.query_params.get('facets') in ('true', '1'):
+            response.data['facets'] = get_facets(
+                self.filter_queryset(self.get_queryset())
+            )
+        return response
+
 
 class GenreViewSet(
+    CachedListMixin,
     ListCreateDestroyMixin,
     viewsets.GenericViewSet,
 ):
@@ -119,6 +244,7 @@ class GenreViewSet(
 
 
 class CategoryViewSet(
+    CachedListMixin,
     ListCreateDestroyMixin,
     viewsets.GenericViewSet,
 ):
@@ -130,20 +256,30 @@ class CategoryViewSet(
     search_fields = ('^name',)
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
+    sparse_required_fields = ('review', 'pub_date')
+    pagination_class = PubDatePagination
     permission_classes = (ContentPermission,)
 
+    def get_condition_scopes(self):
+        return (f'review:{self.kwargs["review_id"]}:comments', 'users')
+
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        return review.comments.all()
+        return self.review.comments.select_related('author')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
 
 class UsersViewSet(
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -188,8 +324,8 @@ class MeViewSet(viewsets.GenericViewSet):
 
     @action(detail=False, methods=['get', 'patch'], url_path='')
     def me(self, request, *args, **kwargs):
+        instance = self.get_queryset().get(pk=request.user.pk)
         if request.method == 'GET':
-            instance = request.user
             serializer = self.get_serializer(instance)
             return Response(serializer.data)
 
@@ -199,7 +335,6 @@ class MeViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        instance = request.user
         serializer = self.get_serializer(
             instance, data=request.data, partial=True
         )
@@ -208,8 +343,16 @@ class MeViewSet(viewsets.GenericViewSet):
         return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    NestedResourceMixin,
+    SparseFieldsetMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
+    sparse_required_fields = ('title', 'pub_date')
+    pagination_class = PubDatePagination
     permission_classes = (ContentPermission,)
     http_method_names = [
         'get',
@@ -221,10 +364,45 @@ class ReviewViewSet(viewsets.ModelViewSet):
         'trace',
     ]
 
+    def get_condition_scopes(self):
+        return (f'title:{self.kwargs["title_id"]}:reviews', 'users')
+
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        return self.title.reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
+
+
+class CacheViewSet(viewsets.GenericViewSet):
+    permission_classes = (IsAdmin,)
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request, *args, **kwargs):
+        counts = get_response_cache_counts()
+        total = counts['hit'] + counts['miss']
+        return Response({
+            'hits': counts['hit'],
+            'misses': counts['miss'],
+            'hit_ratio': counts['hit'] / total if total else None,
+        })
+
+
+class DatabaseViewSet(viewsets.GenericViewSet):
+    permission_classes = (IsAdmin,)
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request, *args, **kwargs):
+        return Response({
+            'pools': get_pool_stats(),
+            'connections': {
+                alias: {
+                    'vendor': connections[alias].vendor,
+                    'conn_max_age': connections[alias].settings_dict[
+                        'CONN_MAX_AGE'
+                    ],
+                    'open': connections[alias].connection is not None,
+                }
+                for alias in connections
+            },
+        })
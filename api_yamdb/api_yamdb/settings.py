@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'users',
     'core',
@@ -32,6 +34,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -40,6 +44,34 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+PROFILING = os.getenv('PROFILING', 'false').lower() == 'true'
+if PROFILING:
+    MIDDLEWARE.insert(0, 'core.middleware.ProfilingMiddleware')
+
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0.01))
+
+PROFILING_CPROFILE_THRESHOLD = (
+    float(os.getenv('PROFILING_CPROFILE_THRESHOLD'))
+    if os.getenv('PROFILING_CPROFILE_THRESHOLD')
+    else None
+)
+
+PROFILING_CPROFILE_DIR = os.getenv(
+    'PROFILING_CPROFILE_DIR',
+    os.path.join(tempfile.gettempdir(), 'yamdb-profiles'),
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yamdb': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -72,9 +104,68 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'password'),
         'HOST': os.getenv('DB_HOST', 'db'),
         'PORT': os.getenv('DB_PORT', 5432),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true'
+        ),
+        # Only connections idle for longer than this many seconds are checked.
+        'CONN_HEALTH_CHECK_IDLE': float(
+            os.getenv('DB_CONN_HEALTH_CHECK_IDLE', 30)
+        ),
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 5)),
+        },
+    }
+}
+
+
+# Read replicas: comma-separated hosts (file names for SQLite) that get
+# the same settings as `default`.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1
+):
+    key = 'NAME' if 'sqlite' in DATABASES['default']['ENGINE'] else 'HOST'
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        key: replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', 5))
+
+
+# Версии данных, закрепления реплик и счётчики должны быть видны всем
+# процессам: воркерам gunicorn, mailer и management-командам. Поэтому по
+# умолчанию кэш файловый, а не LocMemCache одного процесса.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'yamdb-cache'),
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 100000)),
+        },
     }
 }
 
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
+TITLES_BULK_MAX_SIZE = int(os.getenv('TITLES_BULK_MAX_SIZE', 5000))
+
+LEADERBOARD_MIN_REVIEWS = int(os.getenv('LEADERBOARD_MIN_REVIEWS', 5))
+
 
 # Password validation
 
@@ -123,13 +214,41 @@ AUTH_USER_MODEL = 'users.User'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 30))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', 1))
+# Claimed emails not recorded within this many seconds are picked up again.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = int(os.getenv('EMAIL_OUTBOX_CLAIM_TIMEOUT', 300))
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+}
+
+THROTTLE_STORE = os.getenv(
+    'THROTTLE_STORE',
+    os.path.join(tempfile.gettempdir(), 'yamdb-throttle.sqlite3'),
+)
+
+THROTTLE_RATES = {
+    'signup.ip': os.getenv('THROTTLE_SIGNUP_IP', '20/hour'),
+    'signup.username': os.getenv('THROTTLE_SIGNUP_USERNAME', '3/hour'),
+    'get_jwt.ip': os.getenv('THROTTLE_TOKEN_IP', '30/minute'),
+    'get_jwt.username': os.getenv('THROTTLE_TOKEN_USERNAME', '5/minute'),
 }
 
 SIMPLE_JWT = {
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import OutgoingEmail
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'subject',
+        'to',
+        'created',
+        'attempts',
+        'sent',
+    )
+    list_filter = ('sent',)
+    search_fields = ('to',)
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(scope):
+    """Текущая версия данных области `scope`.
+
+    Версия — время последнего изменения в наносекундах: после вытеснения
+    ключа из кэша новая версия не совпадёт с уже использованной.
+    """
+    key = f'version:{scope}'
+    version = cache.get(key)
+    if version is not None:
+        return version
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def bump_version(*scopes):
+    """Меняет версии областей после фиксации текущей транзакции.
+
+    Если сменить версию раньше, параллельный запрос успеет прочитать ещё
+    старые строки и сохранить ответ (и его ETag) под новой версией. Вне
+    транзакции версии меняются сразу, при откате — не меняются.
+    """
+
+    def bump():
+        now = time.time_ns()
+        cache.set_many(
+            {f'version:{scope}': now for scope in scopes}, timeout=None
+        )
+
+    transaction.on_commit(bump)
+
+
+def get_modified(version):
+    """Время изменения версии в секундах."""
+    return version // 10 ** 9
@@ -0,0 +1,71 @@
+from functools import partial
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from core.db.pool import get_or_create_pool
+
+
+def check_connection(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def get_pool(alias, settings_dict):
+    options = settings_dict.get('POOL', {})
+    return get_or_create_pool(
+        f'{alias}:{settings_dict["NAME"]}',
+        max_size=options.get('MAX_SIZE', 10),
+        timeout=options.get('TIMEOUT', 5),
+        check=(
+            check_connection
+            if settings_dict.get('CONN_HEALTH_CHECKS')
+            else None
+        ),
+        check_idle=settings_dict.get('CONN_HEALTH_CHECK_IDLE', 0),
+    )
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL с пулом соединений внутри процесса.
+
+    Закрытие соединения возвращает его в пул, поэтому CONN_MAX_AGE стоит
+    оставить равным 0: соединение отдаётся другим потокам после каждого
+    запроса. Размер и ожидание задаются в POOL: MAX_SIZE и TIMEOUT.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.checkout(
+            partial(super().get_new_connection, conn_params)
+        )
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.in_atomic_block or not self.reset_connection():
+            self.pool.discard(self.connection)
+        else:
+            self.pool.checkin(self.connection)
+
+    def reset_connection(self):
+        """Откатывает незавершённую транзакцию перед возвратом в пул."""
+        connection = self.connection
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                return False
+        return True
@@ -0,0 +1,36 @@
+import time
+
+from django.db import connections
+
+
+def check_connections():
+    """Закрывает повторно используемые соединения, которые уже не работают.
+
+    Проверяются только соединения с CONN_HEALTH_CHECKS в настройках базы,
+    простоявшие без запросов дольше CONN_HEALTH_CHECK_IDLE секунд: недавно
+    работавшее соединение почти наверняка живо, а проверка — это лишний
+    SELECT 1 на каждый запрос.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        settings_dict = connection.settings_dict
+        last_used = getattr(connection, 'last_used', None)
+        max_idle = settings_dict.get('CONN_HEALTH_CHECK_IDLE', 0)
+        if (
+            connection.connection is None
+            or last_used is None
+            or not settings_dict.get('CONN_HEALTH_CHECKS')
+            or now - last_used < max_idle
+            or connection.in_atomic_block
+        ):
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+def mark_connections_used():
+    """Запоминает время последнего запроса открытых соединений потока."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.last_used = now
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """Ограниченный пул соединений, общий для потоков процесса.
+
+    Если все `max_size` соединений заняты, checkout() ждёт освобождения
+    не дольше `timeout` секунд. Функцией `check` проверяются только
+    соединения, пролежавшие в пуле дольше `check_idle` секунд.
+    """
+
+    def __init__(self, max_size, timeout, check=None, check_idle=0):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check = check
+        self.check_idle = check_idle
+        self.idle = deque()
+        self.size = 0
+        self.condition = threading.Condition()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.discarded = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def checkout(self, connect):
+        started = time.monotonic()
+        while True:
+            idle = self.acquire(started + self.timeout)
+            if idle is None:
+                break
+            connection, released = idle
+            if self.is_usable(connection, time.monotonic() - released):
+                self.record_wait(time.monotonic() - started)
+                return connection
+            self.discard(connection)
+
+        self.record_wait(time.monotonic() - started)
+        try:
+            return connect()
+        except Exception:
+            self.discard(None)
+            raise
+
+    def acquire(self, deadline):
+        """(соединение, время возврата) или None, если можно открыть новое."""
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f'No database connection available '
+                        f'in {self.timeout}s (pool size {self.max_size})'
+                    )
+                self.condition.wait(remaining)
+            if self.idle:
+                return self.idle.pop()
+            self.size += 1
+            return None
+
+    def record_wait(self, waited):
+        with self.condition:
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+    def checkin(self, connection):
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        if connection is not None:
+            self.discarded += 1
+            try:
+                connection.close()
+            except Exception:
+                pass
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def is_usable(self, connection, idle_time):
+        if connection.closed:
+            return False
+        if self.check is None or idle_time < self.check_idle:
+            return True
+        try:
+            self.check(connection)
+        except Exception:
+            return False
+        return True
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'discarded': self.discarded,
+                'wait_time': self.wait_time,
+                'max_wait_time': self.max_wait_time,
+            }
+
+
+def get_or_create_pool(key, **options):
+    """Пул процесса по ключу; создаётся при первом обращении."""
+    with pools_lock:
+        if key not in pools:
+            pools[key] = ConnectionPool(**options)
+        return pools[key]
+
+
+def get_pool_stats():
+    with pools_lock:
+        return {key: pool.stats() for key, pool in pools.items()}
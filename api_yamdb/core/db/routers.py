@@ -0,0 +1,37 @@
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Реплика, выбранная для текущего запроса, или None.
+read_replica = ContextVar('read_replica', default=None)
+
+
+def may_be_stale(version):
+    """Могла ли реплика ещё не получить изменения версии `version`.
+
+    Такие ответы не кэшируются и не получают ETag.
+    """
+    return (
+        read_replica.get() is not None
+        and time.time_ns() - version < settings.REPLICA_PIN_SECONDS * 10 ** 9
+    )
+
+
+class ReplicaRouter:
+    """Чтение с реплики, выбранной ReplicaMiddleware для запроса.
+
+    Запись, миграции и чтение вне таких запросов идут в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_replica.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
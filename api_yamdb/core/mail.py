@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import OutgoingEmail
+
+
+def enqueue_mail(subject, body, to: list[str]):
+    return OutgoingEmail.objects.create(
+        subject=subject, body=body, to='\n'.join(to)
+    )
+
+
+def get_retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def defer(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt = now + get_retry_delay(email.attempts)
+
+
+def send_batch(batch, now):
+    with get_connection() as connection:
+        for email in batch:
+            try:
+                EmailMessage(
+                    email.subject,
+                    email.body,
+                    to=email.recipients,
+                    connection=connection,
+                ).send()
+                email.sent = timezone.now()
+            except Exception as e:
+                defer(email, e, now)
+
+
+def claim_batch(batch_size, now):
+    """Забирает пачку писем, откладывая их на EMAIL_OUTBOX_CLAIM_TIMEOUT.
+
+    Строки блокируются со SKIP LOCKED только на время этой короткой
+    транзакции; после неё другие обработчики не видят писем пачки до
+    истечения срока, а если обработчик упал, письма отправятся снова.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                sent__isnull=True,
+                next_attempt__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by('next_attempt')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=[e.pk for e in batch]).update(
+            next_attempt=now
+            + timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+        )
+    return batch
+
+
+def dispatch_outbox(batch_size):
+    """Отправляет пачку писем из очереди через одно соединение.
+
+    Письма забираются в короткой транзакции (claim_batch), отправляются
+    вне транзакции, а результаты записываются одним bulk_update. Неудачные
+    попытки откладываются с экспоненциальной задержкой; если не удалось
+    открыть или закрыть соединение, откладываются все неотправленные
+    письма пачки. Возвращает число отправленных и неотправленных писем.
+    """
+    now = timezone.now()
+    batch = claim_batch(batch_size, now)
+    if not batch:
+        return 0, 0
+
+    attempts = {email.pk: email.attempts for email in batch}
+    try:
+        send_batch(batch, now)
+    except Exception as e:
+        for email in batch:
+            if email.sent is None and email.attempts == attempts[email.pk]:
+                defer(email, e, now)
+
+    OutgoingEmail.objects.bulk_update(
+        batch, ['sent', 'attempts', 'last_error', 'next_attempt']
+    )
+    sent = sum(email.sent is not None for email in batch)
+    return sent, len(batch) - sent
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.mail import dispatch_outbox
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Seconds to wait when the queue is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue and exit',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = dispatch_outbox(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'sent {sent}, failed {failed}')
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
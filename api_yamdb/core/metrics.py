@@ -0,0 +1,89 @@
+"""Метрики Prometheus.
+
+Если задана переменная PROMETHEUS_MULTIPROC_DIR, prometheus_client пишет
+значения в файлы этого каталога, и /metrics суммирует их по всем
+процессам gunicorn и management-командам.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Каталог готовит gunicorn в on_starting, но метрики пишут и процессы без
+# него (management-команды в контейнере), а без каталога первая же метрика
+# падает с FileNotFoundError.
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'HTTP requests by route, method and status',
+    ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'HTTP request latency by route and method',
+    ['route', 'method'],
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10
+    ),
+)
+REQUEST_QUERIES = Histogram(
+    'yamdb_db_queries_per_request',
+    'Database queries per HTTP request by route',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+RESPONSE_CACHE = Counter(
+    'yamdb_response_cache_requests_total',
+    'Response cache lookups by result (hit or miss)',
+    ['result'],
+)
+IMPORTED_ROWS = Counter(
+    'yamdb_import_rows_total',
+    'Rows written by the import and generate commands',
+    ['command', 'model'],
+)
+IMPORT_SECONDS = Counter(
+    'yamdb_import_seconds_total',
+    'Time spent by the import and generate commands',
+    ['command', 'model'],
+)
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def get_response_cache_counts():
+    """Попадания и промахи кэша ответов по всем процессам."""
+    registry = get_registry()
+    return {
+        result: int(
+            registry.get_sample_value(
+                'yamdb_response_cache_requests_total', {'result': result}
+            )
+            or 0
+        )
+        for result in ('hit', 'miss')
+    }
+
+
+def render_metrics():
+    return generate_latest(get_registry()), CONTENT_TYPE_LATEST
+
+
+def record_import(command, model, rows, seconds):
+    IMPORTED_ROWS.labels(command, model).inc(rows)
+    IMPORT_SECONDS.labels(command, model).inc(seconds)
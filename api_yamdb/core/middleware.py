@@ -0,0 +1,237 @@
+import asyncio
+import cProfile
+import hashlib
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db.routers import read_replica
+from core.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS
+from core.profiling import Profile, current_profile, observe_queries
+
+logger = logging.getLogger('yamdb.profiling')
+
+
+def get_pin_key(request):
+    client = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return f'replica-pin:{hashlib.md5(client.encode()).hexdigest()}'
+
+
+class AsyncCapableMiddleware:
+    """Middleware, которое работает и в синхронной, и в асинхронной цепочке.
+
+    Синхронное middleware под ASGI Django 3.2 выполняет через
+    sync_to_async в одном потоке, и запросы идут по очереди. Подклассы
+    реализуют call и асинхронный acall; Django выбирает нужный по тому,
+    какой get_response ему передан.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так asyncio.iscoroutinefunction(self) вернёт True.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
+
+
+class ReplicaMiddleware(AsyncCapableMiddleware):
+    """Отправляет чтение безопасного запроса на одну из реплик.
+
+    После успешного изменяющего запроса клиент (по заголовку Authorization
+    или IP) REPLICA_PIN_SECONDS секунд читает из основной базы и видит
+    свои изменения. Отметка хранится в общем кэше и видна всем воркерам.
+    """
+
+    def choose_replica(self, request, pinned):
+        if request.method in SAFE_METHODS and not pinned:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def should_pin(self, request, response):
+        return (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
+
+    def call(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = get_pin_key(request)
+        token = read_replica.set(
+            self.choose_replica(request, cache.get(key))
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            read_replica.reset(token)
+        if self.should_pin(request, response):
+            cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def acall(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = get_pin_key(request)
+        pinned = await sync_to_async(cache.get, thread_sensitive=False)(key)
+        token = read_replica.set(self.choose_replica(request, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_replica.reset(token)
+        if self.should_pin(request, response):
+            await sync_to_async(cache.set, thread_sensitive=False)(
+                key, True, settings.REPLICA_PIN_SECONDS
+            )
+        return response
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """Время запроса, SQL, аутентификации, сериализации и рендеринга.
+
+    Добавляет заголовок Server-Timing и с вероятностью
+    PROFILING_SAMPLE_RATE пишет строку JSON в лог yamdb.profiling.
+    При DEBUG и заданном PROFILING_CPROFILE_THRESHOLD сохраняет полный
+    cProfile запросов не короче этого числа мс в PROFILING_CPROFILE_DIR;
+    в асинхронной цепочке cProfile видит только поток цикла событий.
+    """
+
+    @contextmanager
+    def profile(self, request):
+        profile = Profile()
+        profiler = None
+        threshold = settings.PROFILING_CPROFILE_THRESHOLD
+        if settings.DEBUG and threshold is not None:
+            profiler = cProfile.Profile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with observe_queries(profile.record_query), ExitStack() as stack:
+                if profiler is not None:
+                    stack.callback(profiler.disable)
+                    profiler.enable()
+                yield profile
+        finally:
+            current_profile.reset(token)
+        profile.add('total', time.perf_counter() - started)
+        if (
+            profiler is not None
+            and profile.timings['total'] * 1000 >= threshold
+        ):
+            self.dump(request, profiler)
+
+    def finish(self, request, response, profile):
+        response['Server-Timing'] = profile.get_server_timing()
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            self.log(request, response, profile)
+        return response
+
+    def call(self, request):
+        with self.profile(request) as profile:
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def acall(self, request):
+        with self.profile(request) as profile:
+            response = await self.get_response(request)
+        return self.finish(request, response, profile)
+
+    def process_template_response(self, request, response):
+        profile = current_profile.get()
+        started = time.perf_counter()
+
+        def rendered(response):
+            profile.add('render', time.perf_counter() - started)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, profile):
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': match.view_name if match else None,
+            'status': response.status_code,
+            **profile.as_dict(),
+        }, ensure_ascii=False))
+
+    def dump(self, request, profiler):
+        directory = Path(settings.PROFILING_CPROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = request.path.strip('/').replace('/', '-') or 'root'
+        path = directory / f'{time.time_ns()}-{request.method}-{name}.prof'
+        profiler.dump_stats(path)
+        logger.warning(
+            'Slow request %s %s profiled to %s',
+            request.method,
+            request.path,
+            path,
+        )
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Число, длительность и SQL-запросы HTTP-запросов по маршрутам.
+
+    Маршрут — имя URL, для вьюсетов это basename и действие роутера
+    (например, titles-list или reviews-detail).
+    """
+
+    @contextmanager
+    def measure(self):
+        stats = {'queries': 0}
+
+        def count_query(execute, sql, params, many, context):
+            stats['queries'] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with observe_queries(count_query):
+            yield stats
+        stats['seconds'] = time.perf_counter() - started
+
+    def record(self, request, response, stats):
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name else 'unmatched'
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        REQUEST_LATENCY.labels(route, request.method).observe(
+            stats['seconds']
+        )
+        REQUEST_QUERIES.labels(route).observe(stats['queries'])
+        return response
+
+    def call(self, request):
+        with self.measure() as stats:
+            response = self.get_response(request)
+        return self.record(request, response, stats)
+
+    async def acall(self, request):
+        with self.measure() as stats:
+            response = await self.get_response(request)
+        return self.record(request, response, stats)
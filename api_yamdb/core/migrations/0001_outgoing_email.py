@@ -0,0 +1,83 @@
+# Generated by Django 3.2 on 2026-10-18 19:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'subject',
+                    models.CharField(max_length=255, verbose_name='тема'),
+                ),
+                ('body', models.TextField(verbose_name='текст')),
+                (
+                    'to',
+                    models.TextField(
+                        help_text='По одному на строку',
+                        verbose_name='получатели',
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='дата создания'
+                    ),
+                ),
+                (
+                    'next_attempt',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name='следующая попытка',
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name='попыток'
+                    ),
+                ),
+                (
+                    'last_error',
+                    models.TextField(
+                        blank=True, verbose_name='последняя ошибка'
+                    ),
+                ),
+                (
+                    'sent',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='дата отправки'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'исходящее письмо',
+                'verbose_name_plural': 'исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(
+                condition=models.Q(sent__isnull=True),
+                fields=['next_attempt'],
+                name='outgoing_email_pending_idx',
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -8,3 +9,36 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    subject = models.CharField('тема', max_length=255)
+    body = models.TextField('текст')
+    to = models.TextField('получатели', help_text='По одному на строку')
+    created = models.DateTimeField('дата создания', auto_now_add=True)
+    next_attempt = models.DateTimeField(
+        'следующая попытка', default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField('попыток', default=0)
+    last_error = models.TextField('последняя ошибка', blank=True)
+    sent = models.DateTimeField('дата отправки', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['next_attempt'],
+                condition=models.Q(sent__isnull=True),
+                name='outgoing_email_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.subject
+
+    @property
+    def recipients(self):
+        return self.to.splitlines()
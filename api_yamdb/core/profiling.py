@@ -0,0 +1,92 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+# Профиль текущего запроса, если включён ProfilingMiddleware.
+current_profile = ContextVar('current_profile', default=None)
+
+# Обёртки SQL-запросов текущего запроса, см. observe_queries.
+query_observers = ContextVar('query_observers', default=())
+
+
+class Profile:
+    """Время запроса по разделам и SQL-запросы, выполненные за это время."""
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.queries = 0
+        self.slowest_query = None
+        self.slowest_query_time = 0.0
+
+    def add(self, name, seconds):
+        self.timings[name] += seconds
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.add('db', elapsed)
+            if elapsed > self.slowest_query_time:
+                self.slowest_query_time = elapsed
+                self.slowest_query = sql
+
+    def get_server_timing(self):
+        metrics = []
+        for name, seconds in self.timings.items():
+            metric = f'{name};dur={seconds * 1000:.2f}'
+            if name == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        return {
+            **{
+                f'{name}_ms': round(seconds * 1000, 2)
+                for name, seconds in self.timings.items()
+            },
+            'queries': self.queries,
+            'slowest_query_ms': round(self.slowest_query_time * 1000, 2),
+            'slowest_query': (self.slowest_query or '')[:300],
+        }
+
+
+@contextmanager
+def timed(name):
+    """Добавляет время блока к разделу `name` профиля текущего запроса."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def observe_queries(observer):
+    """Передаёт observer все SQL-запросы блока, как execute_wrapper.
+
+    В отличие от connection.execute_wrapper видит и запросы из потоков,
+    запущенных через sync_to_async: контекст копируется в них вместе
+    с переменной query_observers.
+    """
+    token = query_observers.set((*query_observers.get(), observer))
+    try:
+        yield
+    finally:
+        query_observers.reset(token)
+
+
+def run_observers(execute, sql, params, many, context):
+    """execute_wrapper каждого соединения, см. core.signals."""
+    for observer in reversed(query_observers.get()):
+        execute = partial(observer, execute)
+    return execute(sql, params, many, context)
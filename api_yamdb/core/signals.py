@@ -0,0 +1,27 @@
+from django.core.signals import request_finished, request_started
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.db.health import check_connections, mark_connections_used
+from core.profiling import run_observers
+
+
+@receiver(request_started)
+def check_connections_on_request(**kwargs):
+    check_connections()
+
+
+@receiver(request_finished)
+def mark_connections_on_finish(**kwargs):
+    mark_connections_used()
+
+
+@receiver(connection_created)
+def install_query_observers(connection, **kwargs):
+    """Подключает observe_queries к каждому новому соединению.
+
+    Обёртка ставится в начало списка: connection.execute_wrapper снимает
+    свою обёртку с конца.
+    """
+    if run_observers not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, run_observers)
@@ -0,0 +1,153 @@
+"""Рейтинги лучших тайтлов: общий, по жанру, по категории и по году.
+
+Место тайтла определяется байесовской оценкой
+
+    (сумма оценок + m * C) / (число отзывов + m),
+
+где m — LEADERBOARD_MIN_REVIEWS, а C — средняя оценка по всем отзывам.
+Тайтлы, у которых отзывов меньше m, в рейтинги не попадают. Оценки хранятся
+в LeaderboardEntry с индексом (board, -score), поэтому страница рейтинга —
+чтение диапазона индекса, а отзыв обновляет оценки тайтла одним UPDATE.
+
+C хранится в LeaderboardPrior и пересчитывается только командой
+rebuild_leaderboards, поэтому между пересборками все процессы меняют оценки
+с одним и тем же C.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    When,
+)
+from django.db.models.functions import Cast
+
+from reviews.models import (
+    GenreTitle,
+    LeaderboardEntry,
+    LeaderboardPrior,
+    Title,
+)
+
+
+def get_board(kind=None, value=None):
+    return 'all' if kind is None else f'{kind}:{value}'
+
+
+def compute_prior(titles=None):
+    if titles is None:
+        titles = Title.objects.all()
+    totals = titles.aggregate(
+        total=Sum('rating_sum'), count=Sum('rating_count')
+    )
+    if not totals['count']:
+        return 0.0
+    return totals['total'] / totals['count']
+
+
+def get_prior():
+    """Средняя оценка по всем отзывам на момент последней пересборки."""
+    return Subquery(LeaderboardPrior.objects.values('value')[:1])
+
+
+def get_score(prior):
+    """Выражение байесовской оценки тайтла, пустое при малом числе отзывов.
+
+    prior — число или выражение, например get_prior().
+    """
+    weight = float(settings.LEADERBOARD_MIN_REVIEWS)
+    return Case(
+        When(
+            rating_count__gte=max(settings.LEADERBOARD_MIN_REVIEWS, 1),
+            then=(Cast('rating_sum', FloatField()) + weight * prior)
+            / (Cast('rating_count', FloatField()) + weight),
+        ),
+        output_field=FloatField(),
+    )
+
+
+def update_scores(title_ids):
+    """Обновляет оценки тайтлов во всех их рейтингах одним запросом."""
+    return LeaderboardEntry.objects.filter(title_id__in=title_ids).update(
+        score=Subquery(
+            Title.objects.filter(pk=OuterRef('title_id'))
+            .annotate(score=get_score(get_prior()))
+            .values('score')[:1]
+        )
+    )
+
+
+def create_entries(titles, prior):
+    titles = list(
+        titles.annotate(score=get_score(prior)).values_list(
+            'pk', 'category_id', 'year', 'score'
+        )
+    )
+    genres = GenreTitle.objects.filter(
+        title_id__in=[pk for pk, *_ in titles]
+    ).values_list('title_id', 'genre_id')
+    entries = [
+        LeaderboardEntry(board=board, title_id=pk, score=score)
+        for pk, category_id, year, score in titles
+        for board in (
+            get_board(),
+            get_board('category', category_id),
+            get_board('year', year),
+        )
+    ]
+    scores = {pk: score for pk, _, _, score in titles}
+    entries.extend(
+        LeaderboardEntry(
+            board=get_board('genre', genre_id),
+            title_id=title_id,
+            score=scores[title_id],
+        )
+        for title_id, genre_id in genres
+    )
+    LeaderboardEntry.objects.bulk_create(entries)
+    return len(titles)
+
+
+def sync_titles(title_ids):
+    """Пересоздаёт записи тайтлов после смены жанров, категории или года."""
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(title_id__in=title_ids).delete()
+        create_entries(Title.objects.filter(pk__in=title_ids), get_prior())
+
+
+def rebuild(batch_size=1000):
+    """Пересчитывает C и заново строит все рейтинги.
+
+    Рейтинги пересобираются в одной транзакции, чтобы читатели не видели
+    их наполовину пустыми. batch_size ограничивает только память и размер
+    одного INSERT: блокировки таблицы рейтингов держатся до конца всей
+    пересборки, и отзывы на это время ждут её завершения.
+    """
+    prior = compute_prior()
+    rebuilt = 0
+    with transaction.atomic():
+        LeaderboardPrior.objects.all().delete()
+        LeaderboardPrior.objects.create(value=prior)
+        LeaderboardEntry.objects.all().delete()
+        last_pk = 0
+        while batch := list(
+            Title.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        ):
+            rebuilt += create_entries(
+                Title.objects.filter(pk__in=batch), prior
+            )
+            last_pk = batch[-1]
+    return rebuilt
+
+
+def get_top(board):
+    """Записи рейтинга от лучшей оценки к худшей."""
+    return (
+        LeaderboardEntry.objects.filter(board=board, score__isnull=False)
+        .order_by('-score', 'title_id')
+    )
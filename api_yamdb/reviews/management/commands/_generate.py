@@ -0,0 +1,147 @@
+import math
+import random
+from itertools import islice
+
+from django.db.models import Max
+
+from reviews.models import Comment, GenreTitle, Review, Title
+from users.models import User
+
+from ._utils import insert_objects
+
+WORDS = (
+    'ночь', 'город', 'море', 'дорога', 'зима', 'война', 'тайна', 'песня',
+    'дом', 'звезда', 'время', 'сад', 'река', 'огонь', 'мост', 'ветер',
+    'письмо', 'остров', 'небо', 'память', 'лес', 'поезд', 'свет', 'тень',
+)
+
+
+def get_next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def get_random(seed, label, start):
+    """Генератор для одной пачки: пачки не зависят от порядка выполнения."""
+    return random.Random(f'{seed}:{label}:{start}')
+
+
+def make_text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def zipf_chunks(total, size, batch_size, exponent):
+    """Раскладывает `total` по `size` элементам с весами 1 / rank ** s.
+
+    Отдаёт (начало пачки, количества) по batch_size элементов, держа в
+    памяти только текущую пачку. Сумма количеств равна `total`.
+    """
+    norm = math.fsum(rank ** -exponent for rank in range(1, size + 1))
+    cumulative = 0.0
+    assigned = 0
+    for start in range(0, size, batch_size):
+        counts = []
+        for rank in range(start + 1, min(start + batch_size, size) + 1):
+            cumulative += rank ** -exponent
+            target = (
+                total if rank == size
+                else math.floor(total * cumulative / norm)
+            )
+            counts.append(target - assigned)
+            assigned = target
+        yield start, counts
+
+
+def generate_dictionaries(model, label, pks):
+    insert_objects(model, [
+        model(pk=pk, name=f'{label.capitalize()} {pk}', slug=f'{label}-{pk}')
+        for pk in pks
+    ])
+
+
+def generate_users(pks):
+    insert_objects(User, [
+        User(
+            pk=pk,
+            username=f'generated-user-{pk}',
+            email=f'generated-user-{pk}@yamdb.fake',
+        )
+        for pk in pks
+    ])
+    return len(pks)
+
+
+def generate_titles(seed, pks, categories, genres):
+    rng = get_random(seed, 'titles', pks.start)
+    titles = []
+    genre_titles = []
+    for pk in pks:
+        titles.append(Title(
+            pk=pk,
+            name=f'{make_text(rng, rng.randint(1, 3))} {pk}',
+            year=rng.randint(1900, 2022),
+            description=make_text(rng, rng.randint(5, 30)),
+            category_id=rng.choice(categories),
+        ))
+        genre_titles.extend(
+            GenreTitle(title_id=pk, genre_id=genre)
+            for genre in rng.sample(
+                genres, rng.randint(1, min(3, len(genres)))
+            )
+        )
+    insert_objects(Title, titles)
+    insert_objects(GenreTitle, genre_titles)
+    return len(pks)
+
+
+def insert_batches(model, objects, batch_size):
+    """Вставляет объекты из итератора пачками, не собирая их все в памяти."""
+    objects = iter(objects)
+    inserted = 0
+    while batch := list(islice(objects, batch_size)):
+        insert_objects(model, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def generate_reviews(seed, start, counts, first_pk, batch_size, titles, users):
+    """Отзывы на тайтлы пачки: у тайтла не больше одного на автора.
+
+    `counts` не должны превышать число пользователей.
+    """
+    rng = get_random(seed, 'reviews', start)
+    authors = (
+        (titles[start + offset], author)
+        for offset, count in enumerate(counts)
+        for author in rng.sample(users, count)
+    )
+    return insert_batches(
+        Review,
+        (
+            Review(
+                pk=pk,
+                title_id=title,
+                author_id=author,
+                text=make_text(rng, rng.randint(5, 60)),
+                score=min(10, max(1, round(rng.gauss(7, 2)))),
+            )
+            for pk, (title, author) in enumerate(authors, start=first_pk)
+        ),
+        batch_size,
+    )
+
+
+def generate_comments(seed, start, counts, batch_size, reviews, users):
+    rng = get_random(seed, 'comments', start)
+    return insert_batches(
+        Comment,
+        (
+            Comment(
+                review_id=reviews[start + offset],
+                author_id=rng.choice(users),
+                text=make_text(rng, rng.randint(3, 30)),
+            )
+            for offset, count in enumerate(counts)
+            for _ in range(count)
+        ),
+        batch_size,
+    )
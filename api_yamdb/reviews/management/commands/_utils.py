@@ -1,5 +1,14 @@
 import csv
+import hashlib
+import io
+import time
 from difflib import SequenceMatcher
+from itertools import islice
+
+from django.apps import apps
+from django.core.management.base import CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
 
 def get_model_files(models, files):
@@ -18,30 +27,326 @@ def get_model_files(models, files):
     return models_for_import
 
 
-def load_data(file, model, out, err):
-    success_count = 0
-    line_nr = 0
+def get_dependencies(model, models):
+    return {
+        field.related_model
+        for field in model._meta.get_fields()
+        if field.concrete
+        and (field.many_to_one or field.one_to_one)
+        and field.related_model in models
+        and field.related_model is not model
+    }
+
+
+def get_import_stages(models):
+    """Раскладывает модели по этапам так, чтобы связанные грузились раньше.
+
+    Модели одного этапа не зависят друг от друга.
+    """
+    dependencies = {model: get_dependencies(model, models) for model in models}
+    stages = []
+    loaded = set()
+    while len(loaded) < len(dependencies):
+        stage = [
+            model
+            for model, required in dependencies.items()
+            if model not in loaded and required <= loaded
+        ]
+        if not stage:
+            raise CommandError(
+                'Circular dependency between models: '
+                + ', '.join(
+                    model.__name__
+                    for model in dependencies
+                    if model not in loaded
+                )
+            )
+        stages.append(stage)
+        loaded.update(stage)
+    return stages
+
+
+class ErrorCollector(list):
+    def write(self, msg):
+        self.append(msg)
+
+
+def import_file(file, model_label, batch_size, upsert=False):
+    """Загружает файл в отдельном процессе со своим соединением с БД."""
+    connection.close()
+    errors = ErrorCollector()
+    started = time.monotonic()
+    load = upsert_data if upsert else load_data
+    loaded = load(file, apps.get_model(model_label), None, errors, batch_size)
+    connection.close()
+    return loaded, time.monotonic() - started, errors
+
+
+def rename_fields(model, names):
+    fields_to_rename = []
+    for field in model._meta.get_fields():
+        if field.__class__.__name__ in ('ForeignKey',):
+            fields_to_rename.append(field.name)
+
+    names = list(names)
+    for i in range(len(names)):
+        if names[i] in fields_to_rename:
+            names[i] += '_id'
+    return names
+
 
+def read_rows(file, model):
+    """Построчно отдаёт (номер строки, данные) из csv-файла модели."""
     with file.open() as f:
         file_content = csv.DictReader(f)
-        fields_to_rename = []
-        for field in model._meta.get_fields():
-            if field.__class__.__name__ in ('ForeignKey',):
-                fields_to_rename.append(field.name)
-
-        names = list(file_content.fieldnames)
-        for i in range(len(names)):
-            if names[i] in fields_to_rename:
-                names[i] += '_id'
-        file_content.fieldnames = names
-
-        for line in file_content:
+        file_content.fieldnames = rename_fields(
+            model, file_content.fieldnames
+        )
+        yield from enumerate(file_content, start=1)
+
+
+def read_objects(file, model, batch_size, report_error):
+    """Отдаёт пачки (номер строки, объект) по batch_size строк."""
+    rows = read_rows(file, model)
+    while chunk := list(islice(rows, batch_size)):
+        numbered_objects = []
+        for line_nr, line in chunk:
             try:
-                line_nr += 1
-                model.objects.create(**line)
-                success_count += 1
+                numbered_objects.append((line_nr, model(**line)))
             except Exception as e:
-                err.write(
-                    f'{model.__name__} : {file.name} : line {line_nr}: {e}'
+                report_error(line_nr, e)
+        if numbered_objects:
+            yield numbered_objects
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_objects(model, objects):
+    fields = [
+        field
+        for field in model._meta.local_concrete_fields
+        if not (field.primary_key and objects[0].pk is None)
+    ]
+    buffer = io.StringIO()
+    for obj in objects:
+        buffer.write('\t'.join(
+            copy_value(
+                field.get_db_prep_save(
+                    field.pre_save(obj, add=True), connection
                 )
+            )
+            for field in fields
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN',
+            buffer,
+        )
+
+
+def insert_objects(model, objects):
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            copy_objects(model, objects)
+        else:
+            model.objects.bulk_create(objects)
+
+
+def save_one_by_one(model, numbered_objects, report_error):
+    saved = 0
+    for line_nr, obj in numbered_objects:
+        try:
+            with transaction.atomic():
+                obj.save(force_insert=True)
+            saved += 1
+        except Exception as e:
+            report_error(line_nr, e)
+    return saved
+
+
+def reset_sequences(model):
+    statements = connection.ops.sequence_reset_sql(no_style(), [model])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def get_error_reporter(file, model, err):
+    def report_error(line_nr, e):
+        err.write(f'{model.__name__} : {file.name} : line {line_nr}: {e}')
+
+    return report_error
+
+
+def load_data(file, model, out, err, batch_size=1000):
+    success_count = 0
+    report_error = get_error_reporter(file, model, err)
+
+    for numbered_objects in read_objects(
+        file, model, batch_size, report_error
+    ):
+        try:
+            insert_objects(model, [obj for _, obj in numbered_objects])
+            success_count += len(numbered_objects)
+        except Exception:
+            success_count += save_one_by_one(
+                model, numbered_objects, report_error
+            )
+
+    reset_sequences(model)
     return success_count
+
+
+def get_update_fields(file, model):
+    """Поля модели из заголовка csv-файла, которые обновляет upsert."""
+    with file.open() as f:
+        names = rename_fields(model, next(csv.reader(f)))
+    fields = {
+        field.attname: field for field in model._meta.local_concrete_fields
+    }
+    return [
+        fields[name]
+        for name in names
+        if name in fields
+        and not fields[name].primary_key
+        and not getattr(fields[name], 'auto_now', False)
+        and not getattr(fields[name], 'auto_now_add', False)
+    ]
+
+
+def get_checksum(fields, values):
+    normalized = [
+        str(field.to_python(value)) for field, value in zip(fields, values)
+    ]
+    return hashlib.md5(repr(normalized).encode()).hexdigest()
+
+
+def insert_on_conflict(model, objects, update_fields):
+    from psycopg2.extras import execute_values
+
+    quote = connection.ops.quote_name
+    fields = model._meta.local_concrete_fields
+    columns = ', '.join(quote(field.column) for field in fields)
+    updates = ', '.join(
+        f'{quote(field.column)} = EXCLUDED.{quote(field.column)}'
+        for field in update_fields
+    )
+    action = f'UPDATE SET {updates}' if updates else 'NOTHING'
+    rows = [
+        tuple(
+            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            for field in fields
+        )
+        for obj in objects
+    ]
+    with connection.cursor() as cursor:
+        execute_values(
+            cursor.cursor,
+            f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+            f'VALUES %s ON CONFLICT ({quote(model._meta.pk.column)}) '
+            f'DO {action}',
+            rows,
+            page_size=len(rows),
+        )
+
+
+def upsert_objects(model, new, changed, update_fields):
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            insert_on_conflict(model, new + changed, update_fields)
+            return
+        model.objects.bulk_create(new)
+        if changed and update_fields:
+            model.objects.bulk_update(
+                changed, [field.name for field in update_fields]
+            )
+
+
+def upsert_one_by_one(numbered_objects, existing, update_fields, report):
+    saved = 0
+    for line_nr, obj in numbered_objects:
+        try:
+            with transaction.atomic():
+                if obj.pk in existing:
+                    obj.save(
+                        update_fields=[field.name for field in update_fields]
+                    )
+                else:
+                    obj.save(force_insert=True)
+            saved += 1
+        except Exception as e:
+            report(line_nr, e)
+    return saved
+
+
+def upsert_data(file, model, out, err, batch_size=1000):
+    """Добавляет новые и обновляет изменённые строки по первичному ключу.
+
+    Неизменённые строки определяются по контрольной сумме полей из файла
+    и не записываются. Возвращает (записано, без изменений).
+    """
+    written = unchanged = 0
+    report_error = get_error_reporter(file, model, err)
+    update_fields = get_update_fields(file, model)
+    attnames = [field.attname for field in update_fields]
+
+    for numbered_objects in read_objects(
+        file, model, batch_size, report_error
+    ):
+        with_pk = []
+        for line_nr, obj in numbered_objects:
+            if obj.pk in (None, ''):
+                report_error(line_nr, 'upsert requires a primary key')
+            else:
+                obj.pk = model._meta.pk.to_python(obj.pk)
+                with_pk.append((line_nr, obj))
+
+        existing = {
+            pk: get_checksum(update_fields, values)
+            for pk, *values in model.objects.filter(
+                pk__in=[obj.pk for _, obj in with_pk]
+            ).values_list('pk', *attnames)
+        }
+        new, changed = [], []
+        for line_nr, obj in with_pk:
+            if obj.pk not in existing:
+                new.append((line_nr, obj))
+            elif existing[obj.pk] != get_checksum(
+                update_fields,
+                [getattr(obj, attname) for attname in attnames],
+            ):
+                changed.append((line_nr, obj))
+        unchanged += len(with_pk) - len(new) - len(changed)
+        if not new and not changed:
+            continue
+
+        try:
+            upsert_objects(
+                model,
+                [obj for _, obj in new],
+                [obj for _, obj in changed],
+                update_fields,
+            )
+            written += len(new) + len(changed)
+        except Exception:
+            written += upsert_one_by_one(
+                new + changed, existing, update_fields, report_error
+            )
+
+    reset_sequences(model)
+    return written, unchanged
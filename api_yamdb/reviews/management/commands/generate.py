@@ -0,0 +1,204 @@
+import multiprocessing
+import time
+from itertools import chain
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.cache import bump_version
+from core.metrics import record_import
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+from ._generate import (
+    generate_comments,
+    generate_dictionaries,
+    generate_reviews,
+    generate_titles,
+    generate_users,
+    get_next_pk,
+    zipf_chunks,
+)
+from ._utils import reset_sequences
+
+SIZES = {
+    'categories': 10,
+    'genres': 30,
+    'users': 1000,
+    'titles': 10000,
+    'reviews': 100000,
+    'comments': 200000,
+}
+
+
+class Command(BaseCommand):
+    help = 'Generates a synthetic dataset directly in the database'
+
+    def add_arguments(self, parser):
+        for name, default in SIZES.items():
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Number of {name} to create',
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='The same seed, sizes and batch size produce the same rows',
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Skew of review and comment popularity',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of rows generated and inserted at once',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes inserting batches at once',
+        )
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in SIZES}
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError('Sizes must not be negative')
+        if sizes['titles'] and not (sizes['categories'] and sizes['genres']):
+            raise CommandError('Titles need at least one category and genre')
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+        self.workers = options['workers']
+        if self.workers < 1:
+            raise CommandError('--workers must be a positive number')
+        seed = options['seed']
+
+        categories = self.get_pks(Category, sizes['categories'])
+        genres = self.get_pks(Genre, sizes['genres'])
+        users = self.get_pks(User, sizes['users'])
+        titles = self.get_pks(Title, sizes['titles'])
+
+        generate_dictionaries(Category, 'category', categories)
+        generate_dictionaries(Genre, 'genre', genres)
+
+        self.run_stage(
+            (User, Title),
+            chain(
+                ((generate_users, (chunk,)) for chunk in self.split(users)),
+                (
+                    (generate_titles, (seed, chunk, categories, genres))
+                    for chunk in self.split(titles)
+                ),
+            ),
+        )
+
+        first_review = get_next_pk(Review)
+        self.run_stage(
+            (Review,),
+            (
+                (
+                    generate_reviews,
+                    (
+                        seed,
+                        start,
+                        [min(count, len(users)) for count in counts],
+                        first_review + offset,
+                        self.batch_size,
+                        titles,
+                        users,
+                    ),
+                )
+                for start, counts, offset in self.with_offsets(
+                    zipf_chunks(
+                        sizes['reviews'],
+                        len(titles),
+                        self.batch_size,
+                        options['zipf'],
+                    ),
+                    len(users),
+                )
+            ),
+        )
+        reviews = range(first_review, get_next_pk(Review))
+
+        self.run_stage(
+            (Comment,),
+            (
+                (
+                    generate_comments,
+                    (seed, start, counts, self.batch_size, reviews, users),
+                )
+                for start, counts in zipf_chunks(
+                    sizes['comments'] if users else 0,
+                    len(reviews),
+                    self.batch_size,
+                    options['zipf'],
+                )
+            ),
+        )
+
+        for model in (Category, Genre, User, Title, Review):
+            reset_sequences(model)
+        call_command('rebuild_ratings', stdout=self.stdout)
+        bump_version('catalog', 'users')
+
+    def get_pks(self, model, size):
+        first_pk = get_next_pk(model)
+        return range(first_pk, first_pk + size)
+
+    def split(self, pks):
+        for start in range(0, len(pks), self.batch_size):
+            yield pks[start:start + self.batch_size]
+
+    def with_offsets(self, chunks, limit):
+        """Добавляет к пачке число отзывов во всех предыдущих пачках."""
+        offset = 0
+        for start, counts in chunks:
+            yield start, counts, offset
+            offset += sum(min(count, limit) for count in counts)
+
+    def run_stage(self, models, jobs):
+        """Выполняет задания этапа, в процессах при --workers больше 1."""
+        started = time.monotonic()
+        if self.workers == 1:
+            created = sum(job(*args) for job, args in jobs)
+        else:
+            created = self.run_parallel(jobs)
+        self.report(models, created, time.monotonic() - started)
+
+    def run_parallel(self, jobs):
+        connections.close_all()
+        created = 0
+        pending = set()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('fork'),
+        ) as executor:
+            for job, args in jobs:
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    created += sum(future.result() for future in done)
+                pending.add(executor.submit(job, *args))
+            created += sum(future.result() for future in wait(pending).done)
+        return created
+
+    def report(self, models, created, elapsed):
+        names = ', '.join(model.__name__ for model in models)
+        record_import('generate', names, created, elapsed)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{names} :: '
+                f'generated {created} records in {elapsed:.2f}s '
+                f'({created / max(elapsed, 1e-6):.0f} rows/s)'
+            )
+        )
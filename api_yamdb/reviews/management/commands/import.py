@@ -1,8 +1,24 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from django.apps import apps
 from django.conf import settings
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.cache import bump_version
+from core.metrics import record_import
+from reviews.models import GenreTitle, Review, Title
 
-from ._utils import get_model_files, load_data
+from ._utils import (
+    get_import_stages,
+    get_model_files,
+    import_file,
+    load_data,
+    upsert_data,
+)
 
 
 class Command(BaseCommand):
@@ -10,8 +26,33 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('model_name', nargs='+', type=str)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows inserted per transaction',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes loading independent models at once',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Insert new and update changed rows instead of plain insert',
+        )
 
     def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers must be a positive number')
+        self.upsert = options['upsert']
+
         models = dict(apps.all_models['reviews'])
         models.update(dict(apps.all_models['users']))
 
@@ -35,21 +76,87 @@ class Command(BaseCommand):
         files = [p for p in path.iterdir() if p.is_file()]
 
         files_models = get_model_files(models_for_import, files)
+        models_files = {model: file for file, model in files_models.items()}
+        stages = get_import_stages(models_files)
 
         self.stdout.write(
             self.style.WARNING(
-                ', '.join(
-                    f'{model.__name__}: {file.name}'
-                    for file, model in files_models.items()
+                ' -> '.join(
+                    ', '.join(
+                        f'{model.__name__}: {models_files[model].name}'
+                        for model in stage
+                    )
+                    for stage in stages
                 )
             )
         )
 
-        for file, model in files_models.items():
-            loaded = load_data(file, model, self.stdout, self.stderr)
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'{model.__name__} :: {file.name} :: successfully '
-                    f'imported {loaded} records \n'
+        for stage in stages:
+            if workers > 1 and len(stage) > 1:
+                self.load_parallel(stage, models_files, workers)
+            else:
+                self.load_sequential(stage, models_files)
+        self.rebuild(models_files)
+
+    def rebuild(self, models_files):
+        """Пересчитывает то, что сигналы обновляют при обычной записи.
+
+        Загрузка идёт в обход сигналов, поэтому рейтинги и места в рейтингах
+        лучших пересчитываются целиком.
+        """
+        if Review in models_files:
+            call_command('rebuild_ratings', stdout=self.stdout)
+        elif Title in models_files or GenreTitle in models_files:
+            call_command('rebuild_leaderboards', stdout=self.stdout)
+        bump_version('catalog')
+
+    def load_sequential(self, stage, models_files):
+        load = upsert_data if self.upsert else load_data
+        for model in stage:
+            started = time.monotonic()
+            loaded = load(
+                models_files[model],
+                model,
+                self.stdout,
+                self.stderr,
+                self.batch_size,
+            )
+            self.report(
+                model, models_files[model], loaded, time.monotonic() - started
+            )
+
+    def load_parallel(self, stage, models_files, workers):
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(stage)),
+            mp_context=multiprocessing.get_context('fork'),
+        ) as executor:
+            futures = {
+                model: executor.submit(
+                    import_file,
+                    models_files[model],
+                    model._meta.label,
+                    self.batch_size,
+                    self.upsert,
                 )
+                for model in stage
+            }
+            for model, future in futures.items():
+                loaded, elapsed, errors = future.result()
+                for error in errors:
+                    self.stderr.write(error)
+                self.report(model, models_files[model], loaded, elapsed)
+
+    def report(self, model, file, loaded, elapsed):
+        unchanged = ''
+        if self.upsert:
+            loaded, skipped = loaded
+            unchanged = f', {skipped} unchanged'
+        record_import('import', model.__name__, loaded, elapsed)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{model.__name__} :: {file.name} :: successfully '
+                f'imported {loaded} records{unchanged} in {elapsed:.2f}s '
+                f'({loaded / max(elapsed, 1e-6):.0f} rows/s) \n'
             )
+        )
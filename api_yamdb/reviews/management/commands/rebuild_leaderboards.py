@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds top-rated title leaderboards from title ratings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help=(
+                'Titles loaded per query; the whole rebuild still runs '
+                'in one transaction'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        rebuilt = leaderboards.rebuild(batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt leaderboards of {rebuilt} titles')
+        )
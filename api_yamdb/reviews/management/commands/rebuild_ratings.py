@@ -0,0 +1,40 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.cache import bump_version
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds denormalized title ratings from reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+
+        last_pk = 0
+        rebuilt = 0
+        while True:
+            batch = list(
+                Title.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                rebuilt += Title.objects.filter(pk__in=batch).rebuild_ratings()
+            last_pk = batch[-1]
+        bump_version('catalog')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt ratings of {rebuilt} titles')
+        )
+        call_command(
+            'rebuild_leaderboards', batch_size=batch_size, stdout=self.stdout
+        )
@@ -0,0 +1,50 @@
+# Generated by Django 3.2 on 2026-10-18 19:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+    )
+    Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='количество оценок'
+            ),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='сумма оценок'
+            ),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
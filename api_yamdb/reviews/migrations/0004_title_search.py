@@ -0,0 +1,78 @@
+# Generated by Django 3.2 on 2026-10-18 19:27
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+CREATE_SEARCH_SQL = (
+    '''
+    CREATE FUNCTION reviews_title_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A')
+            || setweight(
+                to_tsvector('simple', coalesce(NEW.description, '')), 'B'
+            );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    ''',
+    '''
+    CREATE TRIGGER reviews_title_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON reviews_title
+    FOR EACH ROW EXECUTE PROCEDURE reviews_title_search_vector_update()
+    ''',
+    '''
+    UPDATE reviews_title SET search_vector =
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ''',
+    '''
+    CREATE INDEX reviews_title_search_vector_idx
+    ON reviews_title USING gin (search_vector)
+    ''',
+    '''
+    CREATE INDEX reviews_title_name_trgm_idx
+    ON reviews_title USING gin (name gin_trgm_ops)
+    ''',
+)
+
+DROP_SEARCH_SQL = (
+    'DROP INDEX IF EXISTS reviews_title_name_trgm_idx',
+    'DROP INDEX IF EXISTS reviews_title_search_vector_idx',
+    'DROP TRIGGER IF EXISTS reviews_title_search_vector_trigger '
+    'ON reviews_title',
+    'DROP FUNCTION IF EXISTS reviews_title_search_vector_update()',
+)
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_pub_date_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name='поисковый вектор'
+            ),
+        ),
+        migrations.RunPython(
+            run_on_postgresql(CREATE_SEARCH_SQL),
+            run_on_postgresql(DROP_SEARCH_SQL),
+        ),
+    ]
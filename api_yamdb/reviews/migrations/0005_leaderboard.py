@@ -0,0 +1,63 @@
+# Generated by Django 3.2 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'board',
+                    models.CharField(max_length=64, verbose_name='рейтинг'),
+                ),
+                (
+                    'score',
+                    models.FloatField(
+                        null=True, verbose_name='взвешенная оценка'
+                    ),
+                ),
+                (
+                    'title',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='leaderboard_entries',
+                        to='reviews.title',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'место в рейтинге',
+                'verbose_name_plural': 'места в рейтингах',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(
+                fields=['board', '-score', 'title'],
+                name='leaderboard_rank_idx',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(
+                fields=('board', 'title'), name='unique_leaderboard_title'
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardPrior',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('value', models.FloatField(verbose_name='средняя оценка')),
+                (
+                    'updated',
+                    models.DateTimeField(
+                        auto_now=True, verbose_name='пересчитана'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'средняя оценка рейтингов',
+                'verbose_name_plural': 'средние оценки рейтингов',
+            },
+        ),
+    ]
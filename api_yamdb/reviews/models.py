@@ -1,5 +1,25 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+    TrigramSimilarity,
+)
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 
 from core.models import CreatedModel
 from reviews.validators import year_validator
@@ -46,6 +66,67 @@ class Category(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def search(self, text):
+        """Полнотекстовый поиск по названию и описанию.
+
+        На PostgreSQL использует индексированный search_vector и
+        триграммы названия, на остальных базах — поиск по подстроке.
+        Слова запроса ищутся и как начала слов (`побе` найдёт «Побег»)
+        через префиксный tsquery, который обслуживает тот же GIN-индекс.
+        Результат упорядочен по убыванию search_rank.
+        """
+        if connections[self.db].vendor == 'postgresql':
+            words = re.findall(r'\w+', text)
+            query = (
+                SearchQuery(
+                    ' & '.join(f'{word}:*' for word in words),
+                    config='simple',
+                    search_type='raw',
+                )
+                if words
+                else SearchQuery(text, config='simple')
+            )
+            return self.filter(
+                Q(search_vector=query) | Q(name__trigram_similar=text)
+            ).annotate(
+                search_rank=SearchRank(F('search_vector'), query)
+                + TrigramSimilarity('name', text)
+            ).order_by('-search_rank', 'id')
+
+        condition = Q()
+        for word in text.split():
+            condition &= Q(name__icontains=word) | Q(
+                description__icontains=word
+            )
+        return self.filter(condition).annotate(
+            search_rank=Case(
+                When(name__istartswith=text, then=Value(2.0)),
+                When(name__icontains=text, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=models.FloatField(),
+            )
+        ).order_by('-search_rank', 'id')
+
+    def rebuild_ratings(self):
+        """Пересчитывает сумму и количество оценок по отзывам."""
+        reviews = (
+            Review.objects.filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+        )
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0,
+            ),
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         'название тайтла',
@@ -67,10 +148,33 @@ class Title(models.Model):
         on_delete=models.CASCADE,
         related_name='titles',
     )
+    rating_sum = models.PositiveIntegerField(
+        'сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'количество оценок',
+        default=0,
+        editable=False,
+    )
+    search_vector = SearchVectorField(
+        'поисковый вектор',
+        null=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -110,6 +214,12 @@ class Review(CreatedModel):
     class Meta:
         verbose_name = 'отзыв'
         verbose_name_plural = 'отзывы'
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -120,6 +230,10 @@ class Review(CreatedModel):
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
 
 class Comment(CreatedModel):
     author = models.ForeignKey(
@@ -137,6 +251,65 @@ class Comment(CreatedModel):
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class LeaderboardEntry(models.Model):
+    """Оценка тайтла в одном из рейтингов: общем, жанра, категории, года.
+
+    Записи есть у всех тайтлов; у тайтлов с недостаточным числом отзывов
+    оценка пустая, и в рейтинг они не попадают.
+    """
+
+    board = models.CharField('рейтинг', max_length=64)
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+    )
+    score = models.FloatField('взвешенная оценка', null=True)
+
+    class Meta:
+        verbose_name = 'место в рейтинге'
+        verbose_name_plural = 'места в рейтингах'
+        indexes = [
+            models.Index(
+                fields=['board', '-score', 'title'],
+                name='leaderboard_rank_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'title'],
+                name='unique_leaderboard_title',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.board}: {self.title_id}'
+
+
+class LeaderboardPrior(models.Model):
+    """Средняя оценка C, с которой считаются все рейтинги.
+
+    Одна запись на всю базу: её меняет только пересборка рейтингов, поэтому
+    все процессы считают оценки с одним и тем же C.
+    """
+
+    value = models.FloatField('средняя оценка')
+    updated = models.DateTimeField('пересчитана', auto_now=True)
+
+    class Meta:
+        verbose_name = 'средняя оценка рейтингов'
+        verbose_name_plural = 'средние оценки рейтингов'
+
+    def __str__(self):
+        return str(self.value)
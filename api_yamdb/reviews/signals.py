@@ -0,0 +1,157 @@
+from django.apps import apps as global_apps
+from django.db import router
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from reviews import leaderboards
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from users.models import User
+
+
+def change_rating(title_id, score_delta, count_delta):
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+    )
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def lock_review(sender, instance, **kwargs):
+    """Блокирует строку отзыва и запоминает оценку, сохранённую в базе.
+
+    Разница оценок для рейтинга считается от значения в базе, а не от
+    загруженного в объект: иначе параллельные изменения одного отзыва
+    сдвигают rating_sum. Блокировка держится до конца транзакции
+    Review.save и удаления.
+    """
+    instance._stored_rating = (
+        Review.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('title_id', 'score')
+        .first()
+        if instance.pk is not None
+        else None
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    score = int(instance.score)
+    stored = getattr(instance, '_stored_rating', None)
+    if created or stored is None:
+        change_rating(instance.title_id, score, 1)
+        leaderboards.update_scores([instance.title_id])
+        return
+    title_id, stored_score = stored
+    if title_id != instance.title_id:
+        change_rating(title_id, -stored_score, -1)
+        change_rating(instance.title_id, score, 1)
+    elif stored_score != score:
+        change_rating(instance.title_id, score - stored_score, 0)
+    leaderboards.update_scores({title_id, instance.title_id})
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    stored = getattr(instance, '_stored_rating', None)
+    if stored is None:
+        # Отзыв уже удалён другим запросом, и рейтинг им же исправлен.
+        return
+    title_id, score = stored
+    change_rating(title_id, -score, -1)
+    leaderboards.update_scores([title_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(m2m_changed, sender=GenreTitle)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_catalog(sender, action='post_', **kwargs):
+    if action.startswith('post_'):
+        bump_version('catalog')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    bump_version(f'title:{instance.title_id}:reviews')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    bump_version(f'review:{instance.review_id}:comments')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authors(sender, created=False, **kwargs):
+    if not created:
+        bump_version('users')
+
+
+@receiver(post_save, sender=Title)
+def sync_title_leaderboards(sender, instance, **kwargs):
+    leaderboards.sync_titles([instance.pk])
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def sync_genre_title_leaderboards(sender, instance, **kwargs):
+    leaderboards.sync_titles([instance.title_id])
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def sync_title_genres_leaderboards(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        leaderboards.sync_titles([instance.pk])
+    elif pk_set is not None:
+        leaderboards.sync_titles(pk_set)
+    else:
+        LeaderboardEntry.objects.filter(
+            board=leaderboards.get_board('genre', instance.pk)
+        ).delete()
+
+
+@receiver(post_migrate)
+def create_leaderboard_prior(sender, using, apps=global_apps, **kwargs):
+    """Сохраняет C после migrate и flush, если его ещё нет."""
+    if sender.label != 'reviews':
+        return
+    try:
+        prior_model = apps.get_model('reviews', 'LeaderboardPrior')
+    except LookupError:
+        return
+    priors = prior_model.objects.using(using)
+    if router.allow_migrate_model(using, prior_model) and not priors.exists():
+        titles = apps.get_model('reviews', 'Title').objects.using(using)
+        priors.create(value=leaderboards.compute_prior(titles))
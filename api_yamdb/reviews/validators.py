@@ -1,6 +1,7 @@
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 
 def year_validator(value):
     if value < 1900 or value > timezone.now().year:
-        raise ValueError(f'{value} is not a correct year!')
+        raise ValidationError(f'{value} is not a correct year!')
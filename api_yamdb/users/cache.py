@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from users.models import User
+
+# Порядок полей как в модели: Model.from_db раскладывает значения по нему.
+SNAPSHOT_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname
+    in ('id', 'username', 'role', 'is_active', 'is_superuser')
+)
+
+
+def get_user_cache_key(user_id):
+    return f'user:{user_id}:snapshot'
+
+
+def get_cached_user(user_id):
+    """Пользователь из кэша с загруженными полями SNAPSHOT_FIELDS.
+
+    Остальные поля отложены и подгружаются из базы при обращении.
+    Снимок читается из основной базы: отстающая реплика не должна попасть
+    в кэш со старой ролью. Возвращает None, если пользователя нет.
+    """
+    db = router.db_for_write(User)
+    key = get_user_cache_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = (
+            User.objects.using(db)
+            .filter(pk=user_id)
+            .values_list(*SNAPSHOT_FIELDS)
+            .first()
+        )
+        if values is None:
+            return None
+        cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+    return User.from_db(db, SNAPSHOT_FIELDS, values)
+
+
+def forget_user(user_id):
+    cache.delete(get_user_cache_key(user_id))
@@ -0,0 +1,116 @@
+"""Запуск: python -m benchmarks [--output report.json] [--compare old.json].
+
+Бенчмарк создаёт отдельную тестовую базу, заполняет её синтетическими
+данными и удаляет после прогона.
+"""
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+
+from benchmarks import dataset, report, runner  # noqa: E402
+from benchmarks.scenarios import get_scenarios  # noqa: E402
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='YaMDb API benchmarks')
+    for name, default in dataset.DEFAULT_SIZES.items():
+        parser.add_argument(f'--{name}', type=int, default=default)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        dest='scenarios',
+        help='run only this scenario (may be repeated)',
+    )
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report to compare with')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sizes = {name: getattr(args, name) for name in dataset.DEFAULT_SIZES}
+
+    setup_test_environment(debug=False)
+    # Бакеты проверяются на каждом запросе, но не срабатывают: все запросы
+    # бенчмарка идут с одного адреса.
+    settings.THROTTLE_RATES = dict.fromkeys(
+        settings.THROTTLE_RATES, '1000000/s'
+    )
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        started = time.monotonic()
+        data = dataset.seed(sizes, args.seed)
+        sys.stdout.write(
+            f'seeded {sum(sizes.values())} objects '
+            f'in {time.monotonic() - started:.1f}s\n'
+        )
+        scenarios = [
+            scenario
+            for scenario in get_scenarios(
+                data, args.iterations + args.warmup, args.seed
+            )
+            if not args.scenarios or scenario.name in args.scenarios
+        ]
+        results = runner.run(
+            scenarios, args.iterations, args.warmup, sys.stdout
+        )
+        vendor = connection.vendor
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+    result = {
+        'meta': {
+            'commit': get_commit(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'database': vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'sizes': sizes,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'results': results,
+    }
+    if args.output:
+        report.save_report(result, args.output)
+    if args.compare:
+        report.compare(report.load_report(args.compare), result, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Пропускная способность запущенного сервера при многих соединениях.
+
+Запуск: python -m benchmarks.concurrency --url http://localhost:8000
+--path /api/v1/titles/ --path /api/v1/async/titles/ --concurrency 100
+
+Каждое соединение — отдельный поток с keep-alive, который отправляет
+запросы подряд в течение --duration секунд.
+"""
+import argparse
+import http.client
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.report import (
+    compare,
+    load_report,
+    save_report,
+    summarize_latency,
+)
+
+
+def get_connection(url, timeout):
+    parts = urlsplit(url)
+    connection_class = (
+        http.client.HTTPSConnection if parts.scheme == 'https'
+        else http.client.HTTPConnection
+    )
+    return connection_class(parts.netloc, timeout=timeout)
+
+
+def client(url, path, deadline, think_time, timings, errors):
+    connection = get_connection(url, timeout=30)
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(repr(e))
+            connection.close()
+            connection = get_connection(url, timeout=30)
+        timings.append(time.perf_counter() - started)
+        if think_time:
+            time.sleep(think_time)
+    connection.close()
+
+
+def run_path(url, path, concurrency, duration, think_time):
+    timings, errors = [], []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=client,
+            args=(url, path, deadline, think_time, timings, errors),
+        )
+        for _ in range(concurrency)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        **summarize_latency(timings, time.monotonic() - started),
+        'errors': len(errors),
+        'concurrency': concurrency,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--path', action='append', dest='paths')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument(
+        '--think-time',
+        type=float,
+        default=0,
+        help='pause of every client between requests, seconds',
+    )
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', help='JSON report to compare with')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = args.paths or ['/api/v1/titles/', '/api/v1/async/titles/']
+    results = {}
+    for path in paths:
+        results[path] = run_path(
+            args.url, path, args.concurrency, args.duration, args.think_time
+        )
+        result = results[path]
+        sys.stdout.write(
+            f'{path:<32} {result["throughput_rps"]:>8} req/s  '
+            f'p50 {result["p50_ms"]:>8.2f} ms  '
+            f'p99 {result["p99_ms"]:>8.2f} ms  errors {result["errors"]}\n'
+        )
+
+    report = {
+        'meta': {
+            'url': args.url,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'think_time': args.think_time,
+        },
+        'results': results,
+    }
+    if args.output:
+        save_report(report, args.output)
+    if args.compare:
+        compare(load_report(args.compare), report, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
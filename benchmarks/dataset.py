@@ -0,0 +1,51 @@
+"""Синтетический набор данных для бенчмарков.
+
+Строится командой `generate`: популярность произведений и отзывов
+распределена по Ципфу, первые по id тайтлы — самые популярные.
+"""
+import io
+
+from django.core.management import call_command
+from django.db.models import Max
+
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+DEFAULT_SIZES = {
+    'categories': 10,
+    'genres': 30,
+    'users': 500,
+    'titles': 2000,
+    'reviews': 20000,
+    'comments': 40000,
+}
+
+MODELS = {
+    'categories': Category,
+    'genres': Genre,
+    'users': User,
+    'titles': Title,
+    'reviews': Review,
+}
+
+
+def get_last_pk(model):
+    return model.objects.aggregate(last=Max('pk'))['last'] or 0
+
+
+def seed(sizes=None, random_seed=0):
+    """Заполняет базу и возвращает id созданных объектов по моделям.
+
+    Одинаковые `sizes` и `random_seed` дают одинаковые данные.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    last_pks = {name: get_last_pk(model) for name, model in MODELS.items()}
+    call_command('generate', seed=random_seed, stdout=io.StringIO(), **sizes)
+    return {
+        name: list(
+            model.objects.filter(pk__gt=last_pks[name])
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        for name, model in MODELS.items()
+    }
@@ -0,0 +1,105 @@
+"""CPU на JSON одного ответа: стандартные классы DRF против orjson.
+
+Запуск: python -m benchmarks.renderers [--limit 100] [--iterations 500]
+
+Страница списка тайтлов запрашивается один раз, после чего её данные
+многократно рендерятся и разбираются каждой парой рендерер/парсер.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test.utils import (  # noqa: E402
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.parsers import ORJSONParser  # noqa: E402
+from api.renderers import ORJSONRenderer  # noqa: E402
+from benchmarks import dataset  # noqa: E402
+
+PAIRS = {
+    'json': (JSONRenderer, JSONParser),
+    'orjson': (ORJSONRenderer, ORJSONParser),
+}
+
+
+def cpu_time(func, iterations):
+    """Процессорное время одного вызова в микросекундах."""
+    started = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - started) / iterations * 10 ** 6
+
+
+def measure(data, iterations):
+    results = {}
+    for name, (renderer_class, parser_class) in PAIRS.items():
+        renderer, parser = renderer_class(), parser_class()
+        content = renderer.render(data)
+        results[name] = {
+            'render_us': cpu_time(lambda: renderer.render(data), iterations),
+            'parse_us': cpu_time(
+                lambda: parser.parse(io.BytesIO(content)), iterations
+            ),
+            'bytes': len(content),
+        }
+    return results
+
+
+def format_results(results):
+    baseline = results['json']
+    lines = [f'{"":10} {"render µs":>10} {"parse µs":>10} {"bytes":>8}']
+    for name, result in results.items():
+        lines.append(
+            f'{name:10} {result["render_us"]:10.1f} '
+            f'{result["parse_us"]:10.1f} {result["bytes"]:8}'
+        )
+    saving = [
+        1 - results['orjson'][key] / baseline[key] if baseline[key] else 0
+        for key in ('render_us', 'parse_us')
+    ]
+    lines.append(f'{"saving":10} {saving[0]:10.0%} {saving[1]:10.0%}')
+    return '\n'.join(lines) + '\n'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='JSON rendering CPU cost')
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=500)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_test_environment(debug=False)
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        dataset.seed({
+            **dataset.DEFAULT_SIZES,
+            'titles': args.limit,
+            'reviews': args.limit * 5,
+            'comments': 0,
+        })
+        data = APIClient().get('/api/v1/titles/', {'limit': args.limit}).data
+    finally:
+        teardown_databases(old_config, verbosity=0)
+    sys.stdout.write(format_results(measure(data, args.iterations)))
+
+
+if __name__ == '__main__':
+    main()
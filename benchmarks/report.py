@@ -0,0 +1,68 @@
+"""Сводка и сравнение результатов бенчмарков. Не требует Django."""
+import json
+import math
+
+
+def percentile(values, share):
+    """Перцентиль по ближайшему рангу для отсортированного списка."""
+    rank = max(1, math.ceil(share * len(values)))
+    return values[rank - 1]
+
+
+def summarize_latency(timings, elapsed=None):
+    """Перцентили задержки и пропускная способность.
+
+    Без `elapsed` запросы считаются выполненными последовательно.
+    """
+    timings = sorted(timings)
+    elapsed = sum(timings) if elapsed is None else elapsed
+    return {
+        'requests': len(timings),
+        'p50_ms': round(percentile(timings, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'throughput_rps': (
+            round(len(timings) / elapsed, 1) if elapsed else None
+        ),
+    }
+
+
+def format_change(old, new):
+    if not old:
+        return '     n/a'
+    return f'{(new - old) / old * 100:>+7.1f}%'
+
+
+def compare(baseline, report, out):
+    """Печатает изменение метрик относительно прошлого отчёта."""
+    out.write(
+        f'compared with {baseline["meta"].get("commit") or "baseline"}\n'
+    )
+    for name, new in report['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            out.write(f'{name:<16} new scenario\n')
+            continue
+        out.write(
+            f'{name:<16} '
+            + '  '.join(
+                f'{key} {format_change(old[key], new[key])}'
+                for key in (
+                    'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'throughput_rps'
+                )
+                if key in old and key in new
+            )
+            + '\n'
+        )
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write('\n')
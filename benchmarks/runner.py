@@ -0,0 +1,70 @@
+"""Прогон сценариев через тестовый клиент Django и сводка результатов."""
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from rest_framework.test import APIClient
+
+from benchmarks.report import summarize_latency
+
+
+@contextmanager
+def count_queries():
+    counter = [0]
+
+    def wrapper(execute, sql, params, many, context):
+        counter[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def summarize(timings, queries, errors):
+    return {
+        **summarize_latency(timings),
+        'errors': errors,
+        'queries': round(sum(queries) / len(queries), 2),
+        'max_queries': max(queries),
+    }
+
+
+def send(client, scenario, i):
+    method, url, data, headers = scenario.get_request(i)
+    return getattr(client, method)(url, data=data, format='json', **headers)
+
+
+def run_scenario(scenario, iterations, warmup=0):
+    client = APIClient()
+    for i in range(warmup):
+        send(client, scenario, i)
+
+    timings, queries, errors = [], [], 0
+    for i in range(warmup, warmup + iterations):
+        with count_queries() as counter:
+            started = time.perf_counter()
+            response = send(client, scenario, i)
+            timings.append(time.perf_counter() - started)
+        queries.append(counter[0])
+        if response.status_code >= 400:
+            errors += 1
+    return summarize(timings, queries, errors)
+
+
+def run(scenarios, iterations, warmup=0, out=None):
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, iterations, warmup)
+        if out:
+            out.write(format_result(scenario.name, results[scenario.name]))
+    return results
+
+
+def format_result(name, result):
+    errors = f'  errors: {result["errors"]}' if result['errors'] else ''
+    return (
+        f'{name:<16} p50 {result["p50_ms"]:>8.2f} ms  '
+        f'p95 {result["p95_ms"]:>8.2f} ms  p99 {result["p99_ms"]:>8.2f} ms  '
+        f'{result["queries"]:>5} q/req  {result["throughput_rps"]:>8} req/s'
+        f'{errors}\n'
+    )
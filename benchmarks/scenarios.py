@@ -0,0 +1,130 @@
+"""Сценарии бенчмарка: горячие эндпоинты API.
+
+Каждый сценарий по номеру итерации строит запрос
+(метод, url, данные, заголовки).
+"""
+import random
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.utils import code_generator
+from reviews.models import Category, Genre, Review
+from users.models import User
+
+
+class Scenario:
+    def __init__(self, name, method, build):
+        self.name = name
+        self.method = method
+        self.build = build
+
+    def get_request(self, i):
+        url, data, headers = self.build(i)
+        return self.method, url, data, headers
+
+
+def auth(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+
+def create_writers(count):
+    """Пользователи без отзывов: каждый пишет по одному отзыву."""
+    User.objects.bulk_create(
+        User(username=f'bench-writer-{i}', email=f'writer{i}@bench.fake')
+        for i in range(count)
+    )
+    return list(
+        User.objects.filter(username__startswith='bench-writer-')
+        .order_by('pk')
+    )
+
+
+def get_scenarios(dataset, requests, random_seed=0):
+    """Сценарии для `requests` запросов (с учётом прогрева) на каждый."""
+    rng = random.Random(random_seed)
+    titles = dataset['titles']
+    popular = titles[:max(1, len(titles) // 100)]
+    genres = list(
+        Genre.objects.filter(pk__in=dataset['genres'])
+        .values_list('slug', flat=True)
+    )
+    categories = list(
+        Category.objects.filter(pk__in=dataset['categories'])
+        .values_list('slug', flat=True)
+    )
+    reviews = list(
+        Review.objects.filter(pk__in=dataset['reviews'][:1000])
+        .values_list('title_id', 'pk')
+    )
+    reader = User.objects.get(pk=dataset['users'][0])
+    reader_auth = auth(reader)
+    writers = create_writers(requests)
+    writers_auth = [auth(writer) for writer in writers]
+    token_users = User.objects.filter(pk__in=dataset['users'][:requests])
+    codes = [
+        (user.username, code_generator.make_code(user)) for user in token_users
+    ]
+
+    def title_list(i):
+        return f'/api/v1/titles/?offset={rng.randrange(len(titles))}', {}, {}
+
+    def title_filter(i):
+        return (
+            f'/api/v1/titles/?genre={rng.choice(genres)}'
+            f'&category={rng.choice(categories)}'
+            f'&year_min={rng.randint(1950, 2000)}',
+            {},
+            {},
+        )
+
+    def title_detail(i):
+        return f'/api/v1/titles/{rng.choice(titles)}/', {}, {}
+
+    def review_list(i):
+        return f'/api/v1/titles/{rng.choice(popular)}/reviews/', {}, {}
+
+    def review_create(i):
+        return (
+            f'/api/v1/titles/{rng.choice(titles)}/reviews/',
+            {'text': 'Отзыв бенчмарка', 'score': rng.randint(1, 10)},
+            writers_auth[i],
+        )
+
+    def comment_list(i):
+        title, review = rng.choice(reviews)
+        return f'/api/v1/titles/{title}/reviews/{review}/comments/', {}, {}
+
+    def comment_create(i):
+        title, review = rng.choice(reviews)
+        return (
+            f'/api/v1/titles/{title}/reviews/{review}/comments/',
+            {'text': 'Комментарий бенчмарка'},
+            reader_auth,
+        )
+
+    def signup(i):
+        return (
+            '/api/v1/auth/signup/',
+            {'username': f'bench-signup-{i}', 'email': f'{i}@signup.fake'},
+            {},
+        )
+
+    def token(i):
+        username, code = codes[i % len(codes)]
+        return (
+            '/api/v1/auth/token/',
+            {'username': username, 'confirmation_code': code},
+            {},
+        )
+
+    return [
+        Scenario('titles-list', 'get', title_list),
+        Scenario('titles-filter', 'get', title_filter),
+        Scenario('title-detail', 'get', title_detail),
+        Scenario('reviews-list', 'get', review_list),
+        Scenario('review-create', 'post', review_create),
+        Scenario('comments-list', 'get', comment_list),
+        Scenario('comment-create', 'post', comment_create),
+        Scenario('auth-signup', 'post', signup),
+        Scenario('auth-token', 'post', token),
+    ]
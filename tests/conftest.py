@@ -1,9 +1,43 @@
+import os
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+def pytest_configure(config):
+    if os.getenv('DB_ENGINE'):
+        return
+    from django.db import connections
+
+    connections.close_all()
+    for alias in list(connections):
+        try:
+            del connections[alias]
+        except AttributeError:
+            pass
+    connections.settings = connections.configure_settings({
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    from core.throttling import clear_buckets
+
+    cache.clear()
+    clear_buckets()
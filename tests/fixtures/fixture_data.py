@@ -0,0 +1,28 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genres():
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    title = Title.objects.create(
+        name='Побег из Шоушенка',
+        year=1994,
+        description='Описание',
+        category=category,
+    )
+    title.genre.set(genres)
+    return title
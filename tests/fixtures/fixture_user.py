@@ -0,0 +1,45 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin',
+        email='testadmin@yamdb.fake',
+        role='admin',
+    )
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser',
+        email='testuser@yamdb.fake',
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUserAnother',
+        email='testuseranother@yamdb.fake',
+    )
+
+
+def get_client(user):
+    client = APIClient()
+    token = AccessToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def admin_client(admin):
+    return get_client(admin)
+
+
+@pytest.fixture
+def user_client(user):
+    return get_client(user)
@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.base import BaseHandler
+from django.test import AsyncClient
+
+from reviews.models import Comment, Review
+
+
+@async_to_sync
+async def async_request(method, url, **kwargs):
+    return await getattr(AsyncClient(), method)(url, **kwargs)
+
+
+def async_get(url):
+    return async_request('get', url)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadViews:
+
+    def test_same_payload_as_sync(self, client, title, admin):
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=7
+        )
+        Comment.objects.create(review=review, author=admin, text='Да')
+        review_url = f'titles/{title.id}/reviews/{review.id}/'
+
+        for path in (
+            'titles/',
+            f'titles/{title.id}/',
+            'titles/?genre=drama',
+            'genres/',
+            'categories/',
+            f'titles/{title.id}/reviews/',
+            review_url,
+            f'{review_url}comments/',
+        ):
+            response = async_get(f'/api/v1/async/{path}')
+            assert response.status_code == 200, (
+                f'Проверьте, что `/api/v1/async/{path}` доступен'
+            )
+            assert response.json() == client.get(f'/api/v1/{path}').json(), (
+                f'Проверьте, что `/api/v1/async/{path}` отдаёт то же, '
+                f'что и синхронный эндпоинт'
+            )
+
+    def test_not_found_and_read_only(self, title):
+        assert async_get('/api/v1/async/titles/0/').status_code == 404
+        response = async_request(
+            'post', '/api/v1/async/titles/', data={'name': 'Новый'}
+        )
+        assert response.status_code == 405, (
+            'Проверьте, что асинхронные эндпоинты только читают данные'
+        )
+
+
+def test_middleware_is_not_adapted(settings, caplog):
+    settings.MIDDLEWARE = [
+        'core.middleware.ProfilingMiddleware', *settings.MIDDLEWARE
+    ]
+    settings.DEBUG = True
+    with caplog.at_level(logging.DEBUG, logger='django.request'):
+        BaseHandler().load_middleware(is_async=True)
+
+    adapted = [
+        record.getMessage() for record in caplog.records
+        if 'core.middleware' in record.getMessage()
+    ]
+    assert not adapted, (
+        'Проверьте, что middleware проекта работает в асинхронной цепочке '
+        'без sync_to_async, иначе запросы выполняются по очереди'
+    )
@@ -0,0 +1,31 @@
+import pytest
+
+from .utils import assert_max_queries
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+
+    def test_user_is_cached(self, admin_client):
+        admin_client.get('/api/v1/users/')
+        assert_max_queries(admin_client, '/api/v1/users/', 2)
+        assert_max_queries(admin_client, '/api/v1/users/me/', 1)
+
+    def test_role_change_invalidates_cache(
+        self, admin_client, user_client, user
+    ):
+        url = f'/api/v1/users/{user.username}/'
+        assert user_client.get(url).status_code == 403
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        assert user_client.get(url).status_code == 200, (
+            'Проверьте, что смена роли сбрасывает кэш пользователя'
+        )
+
+    def test_deleted_user_is_rejected(self, admin_client, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get('/api/v1/users/me/').status_code == 401
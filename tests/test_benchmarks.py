@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from benchmarks import dataset, renderers, report, runner
+from benchmarks.scenarios import get_scenarios
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+SIZES = {
+    'categories': 2,
+    'genres': 4,
+    'users': 10,
+    'titles': 20,
+    'reviews': 60,
+    'comments': 80,
+}
+
+
+@pytest.mark.django_db
+class TestBenchmarks:
+
+    def test_seed_is_deterministic(self):
+        first = dataset.seed(SIZES, random_seed=1)
+        scores = list(Review.objects.values_list('title_id', 'score'))
+        assert len(first['titles']) == 20
+        assert Title.objects.filter(rating_count__gt=0).exists(), (
+            'Проверьте, что после заполнения пересчитываются рейтинги'
+        )
+
+        for model in (Title, Category, Genre, User):
+            model.objects.all().delete()
+        second = dataset.seed(SIZES, random_seed=1)
+        offset = second['titles'][0] - first['titles'][0]
+        assert [
+            (title - offset, score)
+            for title, score in Review.objects.values_list('title_id', 'score')
+        ] == scores
+
+    def test_scenarios_run_without_errors(self):
+        data = dataset.seed(SIZES)
+        out = io.StringIO()
+        results = runner.run(get_scenarios(data, 3), 2, warmup=1, out=out)
+
+        for name, result in results.items():
+            assert result['errors'] == 0, f'Сценарий {name} вернул ошибки'
+            assert result['p50_ms'] <= result['p99_ms']
+        assert 'titles-list' in out.getvalue()
+
+    def test_compare(self):
+        result = {'p50_ms': 2, 'p95_ms': 4, 'p99_ms': 8, 'queries': 2}
+        baseline = {'meta': {'commit': 'abc'}, 'results': {'a': result}}
+        new = {'results': {
+            'a': {**result, 'p50_ms': 1},
+            'b': result,
+        }}
+        out = io.StringIO()
+        report.compare(baseline, new, out)
+        assert '-50.0%' in out.getvalue()
+        assert 'b                new scenario' in out.getvalue()
+
+
+def test_renderers():
+    results = renderers.measure({'results': [{'id': 1}] * 10}, 5)
+
+    assert set(results) == {'json', 'orjson'}
+    assert 'saving' in renderers.format_results(results)
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import GenreTitle, Title
+
+URL = '/api/v1/titles/bulk/'
+
+
+def post(client, data):
+    return client.post(URL, json.dumps(data), content_type='application/json')
+
+
+def make_titles(count, **kwargs):
+    return [
+        {
+            'name': f'Тайтл {i}',
+            'year': 2000,
+            'description': 'Описание',
+            'genre': ['drama', 'comedy'],
+            'category': 'movie',
+            **kwargs,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestTitlesBulk:
+
+    def test_create(self, admin_client, category, genres):
+        with CaptureQueriesContext(connection) as context:
+            response = post(admin_client, make_titles(50))
+
+        assert response.status_code == 201, response.json()
+        assert len(response.json()) == 50
+        assert response.json()[0]['genre'] == ['drama', 'comedy']
+        assert response.json()[0]['category'] == 'movie'
+        assert Title.objects.count() == 50
+        assert GenreTitle.objects.count() == 100
+        lookups = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_genre"' in query['sql']
+            and 'INNER JOIN' not in query['sql']
+        ]
+        assert len(lookups) == 1, (
+            'Проверьте, что жанры всех тайтлов загружаются одним запросом'
+        )
+
+    def test_item_errors(self, admin_client, category, genres):
+        titles = make_titles(3)
+        titles[1]['genre'] = ['drama', 'unknown']
+        titles[2]['category'] = 'unknown'
+        response = post(admin_client, titles)
+
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'genre' in errors[1] and 'category' in errors[2], (
+            'Проверьте, что ошибки возвращаются для каждого тайтла'
+        )
+        assert not Title.objects.exists()
+
+    def test_invalid_year(self, admin_client, category, genres):
+        titles = make_titles(3)
+        titles[1]['year'] = 3000
+        titles[2]['year'] = 1800
+        response = post(admin_client, titles)
+
+        assert response.status_code == 400, (
+            'Проверьте, что неверный год — ошибка тайтла, а не сервера'
+        )
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'year' in errors[1] and 'year' in errors[2]
+        assert not Title.objects.exists()
+
+    def test_invalidates_catalog(
+        self,
+        admin_client,
+        client,
+        category,
+        genres,
+        django_capture_on_commit_callbacks,
+    ):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        with django_capture_on_commit_callbacks(execute=True):
+            post(admin_client, make_titles(2))
+
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+
+    def test_limits(self, admin_client, user_client, settings):
+        settings.TITLES_BULK_MAX_SIZE = 1
+        assert post(admin_client, make_titles(2)).status_code == 400
+        assert post(admin_client, {'name': 'x'}).status_code == 400
+        assert post(user_client, make_titles(1)).status_code == 403
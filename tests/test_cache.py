@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, Review
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_catalog_cache(
+        self, client, admin_client, title, django_capture_on_commit_callbacks
+    ):
+        url = '/api/v1/titles/?limit=5'
+        before = admin_client.get('/api/v1/cache/stats/').json()
+        assert client.get(url)['X-Cache'] == 'MISS'
+        assert client.get(url)['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос отдаётся из кэша'
+        )
+        assert client.get(f'{url}&offset=1')['X-Cache'] == 'MISS', (
+            'Проверьте, что параметры запроса входят в ключ кэша'
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            title.genre.add(
+                Genre.objects.create(name='Вестерн', slug='western')
+            )
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанров тайтла сбрасывает кэш'
+        )
+        assert len(response.json()['results'][0]['genre']) == 3
+
+        stats = admin_client.get('/api/v1/cache/stats/').json()
+        assert stats['hits'] - before['hits'] == 1
+        assert stats['misses'] - before['misses'] == 3
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_reviews_etag(
+        self, client, title, user, django_capture_on_commit_callbacks
+    ):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified']
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert not context.captured_queries, (
+            'Проверьте, что ответ 304 отдаётся без запросов к базе'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Review.objects.create(title=title, author=user, text='', score=3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов'
+        )
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+def test_uncommitted_writes_are_not_cached(client, title, user):
+    reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+    titles_url = '/api/v1/titles/'
+    etag = client.get(reviews_url)['ETag']
+    client.get(titles_url)
+
+    with transaction.atomic():
+        Review.objects.create(title=title, author=user, text='', score=3)
+        # Пока запись не зафиксирована, читатели видят прежние версии:
+        # ответы, собранные сейчас, не должны получить новые ETag и ключ.
+        assert client.get(
+            reviews_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 304, (
+            'Проверьте, что ETag не меняется до фиксации транзакции'
+        )
+        response = client.get(titles_url)
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что версия кэша не меняется до фиксации транзакции'
+        )
+        assert response.json()['results'][0]['rating'] is None
+
+    response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()['count'] == 1
+    response = client.get(titles_url)
+    assert response['X-Cache'] == 'MISS'
+    assert response.json()['results'][0]['rating'] == 3
+
+
+def test_cache_is_shared_between_processes(settings):
+    assert 'locmem' not in settings.CACHES['default']['BACKEND'], (
+        'Проверьте, что версии кэша видны management-командам и всем '
+        'воркерам: по умолчанию нужен общий для процессов кэш'
+    )
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+from django.db import connection
+
+from core.db import pool as pools
+from core.db.pool import ConnectionPool, PoolTimeout
+from core.db.health import check_connections
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool:
+
+    def test_connections_are_reused(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        first = pool.checkout(FakeConnection)
+        pool.checkin(first)
+
+        assert pool.checkout(FakeConnection) is first, (
+            'Проверьте, что пул отдаёт освободившееся соединение'
+        )
+        assert pool.stats()['size'] == 1
+        assert pool.stats()['checkouts'] == 2
+
+    def test_size_is_bounded(self):
+        pool = ConnectionPool(max_size=1, timeout=0.05)
+        first = pool.checkout(FakeConnection)
+
+        with pytest.raises(PoolTimeout):
+            pool.checkout(FakeConnection)
+        assert pool.stats()['timeouts'] == 1
+
+        timer = threading.Timer(0.01, pool.checkin, (first,))
+        timer.start()
+        pool.timeout = 1
+        assert pool.checkout(FakeConnection) is first, (
+            'Проверьте, что checkout дожидается освобождения соединения'
+        )
+        assert pool.stats()['max_wait_time'] > 0
+
+    def test_broken_connections_are_replaced(self):
+        def check(conn):
+            raise OSError('server closed the connection')
+
+        pool = ConnectionPool(max_size=1, timeout=1, check=check)
+        broken = pool.checkout(FakeConnection)
+        pool.checkin(broken)
+
+        fresh = pool.checkout(FakeConnection)
+        assert fresh is not broken and broken.closed
+        assert pool.stats()['discarded'] == 1
+        assert pool.stats()['size'] == 1
+
+    def test_recently_used_connections_are_not_checked(self):
+        checked = []
+        pool = ConnectionPool(
+            max_size=1, timeout=1, check=checked.append, check_idle=60
+        )
+        pool.checkin(pool.checkout(FakeConnection))
+        pool.checkout(FakeConnection)
+
+        assert not checked, (
+            'Проверьте, что пул не проверяет недавно возвращённые соединения'
+        )
+
+
+@pytest.mark.django_db
+class TestHealthChecks:
+
+    def test_unusable_connection_is_closed(self, monkeypatch):
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setitem(
+            connection.settings_dict, 'CONN_HEALTH_CHECK_IDLE', 30
+        )
+        monkeypatch.setattr(connection, 'in_atomic_block', False)
+        checked = []
+        monkeypatch.setattr(
+            connection, 'is_usable', lambda: checked.append(1) and False
+        )
+        closed = []
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+
+        monkeypatch.setattr(connection, 'last_used', time.monotonic(), False)
+        check_connections()
+        assert not checked, (
+            'Проверьте, что недавно работавшее соединение не проверяется'
+        )
+
+        monkeypatch.setattr(connection, 'last_used', time.monotonic() - 60)
+        check_connections()
+        assert closed, 'Проверьте, что неработающее соединение закрывается'
+
+    def test_stats_endpoint(self, admin_client, user_client):
+        assert user_client.get('/api/v1/db/stats/').status_code == 403
+        response = admin_client.get('/api/v1/db/stats/')
+        assert response.status_code == 200
+        assert set(response.json()) == {'pools', 'connections'}
+        assert 'default' in response.json()['connections']
+
+    def test_stats_endpoint_reports_pools(self, admin_client, monkeypatch):
+        monkeypatch.setattr(pools, 'pools', {})
+        pools.get_or_create_pool('default:yamdb', max_size=3, timeout=1)
+        response = admin_client.get('/api/v1/db/stats/')
+        assert response.json()['pools']['default:yamdb']['max_size'] == 3, (
+            'Проверьте, что /db/stats/ показывает пулы из core.db.pool'
+        )
@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from reviews.models import Comment, Review, Title
+
+
+def run_generate(**options):
+    call_command(
+        'generate',
+        categories=2,
+        genres=5,
+        users=20,
+        titles=50,
+        reviews=300,
+        comments=400,
+        batch_size=16,
+        stdout=StringIO(),
+        **options,
+    )
+
+
+def get_reviews():
+    """Отзывы с id тайтлов и авторов, отсчитанными от первых созданных."""
+    reviews = list(Review.objects.order_by('pk').values_list(
+        'title_id', 'author_id', 'score', 'text'
+    ))
+    first_title = min(review[0] for review in reviews)
+    first_author = min(review[1] for review in reviews)
+    return [
+        (title - first_title, author - first_author, score, text)
+        for title, author, score, text in reviews
+    ]
+
+
+@pytest.mark.django_db
+class TestGenerate:
+
+    def test_dataset(self):
+        run_generate()
+
+        assert Comment.objects.count() == 400
+        per_title = list(
+            Title.objects.annotate(total=Count('reviews'))
+            .order_by('pk')
+            .values_list('total', flat=True)
+        )
+        assert per_title[0] == 20, (
+            'Проверьте, что у тайтла не больше одного отзыва на автора'
+        )
+        assert per_title[0] > per_title[-1], (
+            'Проверьте, что популярность тайтлов неравномерна'
+        )
+        title = Title.objects.first()
+        assert title.rating_count == per_title[0]
+        assert title.genre.exists()
+
+    def test_same_seed_gives_same_rows(self):
+        run_generate(seed=7)
+        first = get_reviews()
+        Title.objects.all().delete()
+
+        run_generate(seed=7)
+        assert get_reviews() == first
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError
+
+from reviews.management.commands._utils import (
+    copy_value,
+    get_import_stages,
+    insert_objects,
+    load_data,
+)
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from users.models import User
+
+
+ALL_MODELS = (
+    'Comment', 'Review', 'Title', 'GenreTitle', 'Genre', 'Category', 'User'
+)
+
+
+def run_import(*args, models=ALL_MODELS):
+    out, err = StringIO(), StringIO()
+    call_command(
+        'import',
+        *models,
+        *args,
+        stdout=out,
+        stderr=err,
+    )
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImport:
+
+    def test_import_orders_models(self):
+        out, err = run_import('--batch-size', '7')
+        assert not err, f'Импорт завершился с ошибками:\n{err}'
+        assert Comment.objects.exists() and Review.objects.exists()
+        title = Title.objects.get(pk=1)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта отзывов пересчитывается рейтинг'
+        )
+
+    def test_upsert_is_idempotent(self):
+        run_import('--upsert')
+        Title.objects.filter(pk=1).update(name='Изменено', description='Д')
+        reviews = Review.objects.count()
+
+        out, err = run_import('--upsert')
+        assert not err, f'Повторный импорт завершился с ошибками:\n{err}'
+        assert Review.objects.count() == reviews
+        title = Title.objects.get(pk=1)
+        assert title.name == 'Побег из Шоушенка', (
+            'Проверьте, что upsert обновляет изменённые строки'
+        )
+        assert title.description == 'Д', (
+            'Проверьте, что upsert не трогает поля, которых нет в файле'
+        )
+        assert 'imported 1 records, 31 unchanged' in out
+
+    def test_titles_enter_leaderboards(self):
+        out, err = run_import(
+            models=('Title', 'GenreTitle', 'Genre', 'Category')
+        )
+        assert not err, f'Импорт завершился с ошибками:\n{err}'
+        assert LeaderboardEntry.objects.filter(
+            board='all'
+        ).count() == Title.objects.count(), (
+            'Проверьте, что тайтлы, импортированные без отзывов, попадают '
+            'в рейтинги лучших'
+        )
+
+
+def test_import_stages():
+    stages = get_import_stages(
+        [Comment, Review, Title, GenreTitle, Genre, Category, User]
+    )
+    assert [set(stage) for stage in stages] == [
+        {Genre, Category, User},
+        {Title},
+        {Review, GenreTitle},
+        {Comment},
+    ], 'Проверьте, что связанные модели загружаются на более ранних этапах'
+
+
+def test_parallel_import(tmp_path):
+    """Импорт в несколько процессов: им нужна общая база в файле."""
+    database = tmp_path / 'db.sqlite3'
+    env = {
+        **os.environ,
+        'DB_ENGINE': 'django.db.backends.sqlite3',
+        'DB_NAME': str(database),
+        'CACHE_LOCATION': str(tmp_path / 'cache'),
+        'THROTTLE_STORE': str(tmp_path / 'throttle.sqlite3'),
+    }
+    manage = [sys.executable, str(settings.BASE_DIR / 'manage.py')]
+    subprocess.run(
+        [*manage, 'migrate', '--verbosity', '0'], env=env, check=True
+    )
+    result = subprocess.run(
+        [*manage, 'import', *ALL_MODELS, '--workers', '2'],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert not result.stderr, (
+        f'Импорт завершился с ошибками:\n{result.stderr}'
+    )
+
+    with sqlite3.connect(database) as db:
+        counts = {
+            table: db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('reviews_title', 'reviews_genretitle',
+                          'reviews_review', 'reviews_comment')
+        }
+        unrated = db.execute(
+            'SELECT COUNT(*) FROM reviews_title t WHERE rating_count != '
+            '(SELECT COUNT(*) FROM reviews_review r WHERE r.title_id = t.id)'
+        ).fetchone()[0]
+    assert all(counts.values()), counts
+    assert not unrated
+
+
+@pytest.mark.django_db
+class TestLoadData:
+
+    def write_genres(self, tmp_path, slugs):
+        path = tmp_path / 'genre.csv'
+        path.write_text(
+            'id,name,slug\n'
+            + ''.join(
+                f'{pk},Жанр {pk},{slug}\n'
+                for pk, slug in enumerate(slugs, start=1)
+            )
+        )
+        return path
+
+    def test_bad_row_in_batch(self, tmp_path):
+        path = self.write_genres(
+            tmp_path, ['drama', 'comedy', 'drama', 'horror', 'western']
+        )
+        err = StringIO()
+        loaded = load_data(path, Genre, StringIO(), err, batch_size=4)
+
+        assert loaded == 4
+        assert err.getvalue().startswith('Genre : genre.csv : line 3:'), (
+            'Проверьте, что в ошибке указана строка csv-файла'
+        )
+        assert sorted(Genre.objects.values_list('slug', flat=True)) == [
+            'comedy', 'drama', 'horror', 'western'
+        ]
+        assert Genre.objects.get(slug='drama').pk == 1
+
+    def test_failed_batch_is_not_partially_saved(self):
+        genres = [
+            Genre(name=slug, slug=slug)
+            for slug in ('drama', 'comedy', 'drama', 'horror')
+        ]
+        with pytest.raises(IntegrityError):
+            insert_objects(Genre, genres)
+        assert not Genre.objects.exists(), (
+            'Проверьте, что пачка с ошибкой не сохраняется частично'
+        )
+
+    def test_copy_value(self):
+        assert copy_value(None) == '\\N'
+        assert copy_value('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
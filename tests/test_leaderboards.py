@@ -0,0 +1,125 @@
+import pytest
+from django.core.management import call_command
+
+from reviews import leaderboards
+from reviews.models import (
+    Genre,
+    LeaderboardEntry,
+    LeaderboardPrior,
+    Review,
+    Title,
+)
+
+from .utils import assert_max_queries
+
+URL = '/api/v1/titles/top/'
+
+
+@pytest.fixture
+def ranked(settings, django_user_model, category, genres):
+    """Три тайтла: с оценками 9 и 9, 10 и 6 и с одним отзывом."""
+    settings.LEADERBOARD_MIN_REVIEWS = 2
+    users = [
+        django_user_model.objects.create(
+            username=f'critic{i}', email=f'critic{i}@yamdb.fake'
+        )
+        for i in range(2)
+    ]
+    titles = []
+    for year, scores in ((2000, (9, 9)), (2001, (10, 6)), (2002, (10,))):
+        title = Title.objects.create(
+            name=f'Тайтл {year}', year=year, category=category
+        )
+        title.genre.set(genres[:1] if year == 2000 else genres)
+        for user, score in zip(users, scores):
+            Review.objects.create(
+                title=title, author=user, text='', score=score
+            )
+        titles.append(title)
+    call_command('rebuild_leaderboards')
+    return titles, users
+
+
+def get_entries():
+    return {
+        (entry.board, entry.title_id, entry.score is None)
+        for entry in LeaderboardEntry.objects.all()
+    }
+
+
+def get_ids(client, url):
+    return [title['id'] for title in client.get(url).json()['results']]
+
+
+@pytest.mark.django_db
+class TestLeaderboards:
+
+    def test_top(self, client, ranked):
+        titles, _ = ranked
+        results = client.get(URL).json()['results']
+
+        assert [title['id'] for title in results] == [
+            titles[0].id, titles[1].id
+        ], 'Проверьте, что тайтлы без минимума отзывов не попадают в рейтинг'
+        prior = LeaderboardPrior.objects.get().value
+        assert results[0]['score'] == pytest.approx(
+            (18 + 2 * prior) / 4
+        ), 'Проверьте, что оценка байесовская'
+        assert results[0]['genre'] and results[0]['category']
+
+    def test_boards(self, client, ranked):
+        titles, _ = ranked
+
+        assert get_ids(client, f'{URL}?genre=comedy') == [titles[1].id]
+        assert get_ids(client, f'{URL}?category=movie') == [
+            titles[0].id, titles[1].id
+        ]
+        assert get_ids(client, f'{URL}?year=2001') == [titles[1].id]
+        assert client.get(f'{URL}?genre=unknown').status_code == 404
+        assert client.get(f'{URL}?genre=drama&year=2000').status_code == 400
+
+    def test_incremental_updates(self, client, ranked):
+        titles, users = ranked
+        Review.objects.create(
+            title=titles[2], author=users[1], text='', score=10
+        )
+        review = Review.objects.get(title=titles[0], author=users[1])
+        review.score = 1
+        review.save()
+        titles[1].genre.set(Genre.objects.filter(slug='drama'))
+
+        assert get_ids(client, URL) == [
+            titles[2].id, titles[1].id, titles[0].id
+        ], 'Проверьте, что отзывы сразу меняют рейтинг'
+        assert get_ids(client, f'{URL}?genre=comedy') == [titles[2].id]
+
+        incremental = get_entries()
+        leaderboards.rebuild()
+        assert get_entries() == incremental, (
+            'Проверьте, что пересборка даёт те же рейтинги'
+        )
+
+    def test_prior_is_stored(self, client, ranked):
+        titles, users = ranked
+        prior = LeaderboardPrior.objects.get().value
+        assert prior == pytest.approx(44 / 5)
+
+        Review.objects.create(
+            title=titles[2], author=users[1], text='', score=1
+        )
+        assert LeaderboardPrior.objects.get().value == prior, (
+            'Проверьте, что C меняется только при пересборке'
+        )
+        score = LeaderboardEntry.objects.get(
+            board='all', title=titles[2]
+        ).score
+        assert score == pytest.approx((11 + 2 * prior) / 4), (
+            'Проверьте, что отзывы пересчитывают оценку с сохранённым C'
+        )
+
+        leaderboards.rebuild()
+        assert LeaderboardPrior.objects.get().value == pytest.approx(45 / 6)
+
+    def test_query_budget(self, client, ranked):
+        assert_max_queries(client, URL, 2)
+        assert_max_queries(client, f'{URL}?genre=drama', 3)
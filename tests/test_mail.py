@@ -0,0 +1,82 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import connection
+
+from core.mail import dispatch_outbox
+from core.models import OutgoingEmail
+
+
+@pytest.mark.django_db
+class TestMailOutbox:
+
+    def test_signup_enqueues_mail(self, client):
+        response = client.post(
+            '/api/v1/auth/signup/',
+            data={'username': 'new_user', 'email': 'new_user@yamdb.fake'},
+        )
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется во время запроса'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipients == ['new_user@yamdb.fake']
+
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 1
+        assert 'confirmation_code' in mail.outbox[0].body
+        email.refresh_from_db()
+        assert email.sent is not None
+
+    def test_failed_mail_is_retried_later(self, monkeypatch):
+        OutgoingEmail.objects.create(subject='s', body='b', to='a@b.c')
+
+        def fail(self, *args, **kwargs):
+            raise ConnectionError('smtp is down')
+
+        monkeypatch.setattr(mail.EmailMessage, 'send', fail)
+        call_command('send_emails', '--once')
+
+        email = OutgoingEmail.objects.get()
+        assert email.sent is None and email.attempts == 1
+        assert email.last_error == 'smtp is down'
+        assert email.next_attempt > email.created, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+    def test_connection_failure_defers_batch(self, monkeypatch):
+        for address in ('a@b.c', 'd@e.f'):
+            OutgoingEmail.objects.create(subject='s', body='b', to=address)
+
+        def fail(self):
+            raise ConnectionRefusedError('smtp is down')
+
+        monkeypatch.setattr(locmem.EmailBackend, 'open', fail)
+        call_command('send_emails', '--once')
+
+        for email in OutgoingEmail.objects.all():
+            assert email.sent is None and email.attempts == 1, (
+                'Проверьте, что при недоступном SMTP откладывается вся пачка'
+            )
+            assert email.last_error == 'smtp is down'
+            assert email.next_attempt > email.created
+
+
+@pytest.mark.django_db(transaction=True)
+def test_mail_is_sent_outside_transaction(monkeypatch):
+    OutgoingEmail.objects.create(subject='s', body='b', to='a@b.c')
+    seen = []
+    send = locmem.EmailBackend.send_messages
+
+    def send_messages(self, messages):
+        seen.append((connection.in_atomic_block, dispatch_outbox(10)))
+        return send(self, messages)
+
+    monkeypatch.setattr(locmem.EmailBackend, 'send_messages', send_messages)
+    assert dispatch_outbox(10) == (1, 0)
+    assert seen == [(False, (0, 0))], (
+        'Проверьте, что письма отправляются вне транзакции и забранные '
+        'письма не достаются другим обработчикам'
+    )
+    assert OutgoingEmail.objects.get().sent is not None
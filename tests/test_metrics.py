@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient
+from prometheus_client import REGISTRY
+
+from core.metrics import render_metrics
+
+
+def get_value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_request_metrics(self, client, title):
+        labels = {'route': 'titles-list', 'method': 'GET'}
+        before = get_value('yamdb_http_requests_total', status='200', **labels)
+        client.get('/api/v1/titles/')
+
+        assert get_value(
+            'yamdb_http_requests_total', status='200', **labels
+        ) == before + 1, 'Проверьте, что запросы считаются по маршрутам'
+        assert get_value(
+            'yamdb_http_request_duration_seconds_count', **labels
+        ) > 0
+        assert get_value(
+            'yamdb_db_queries_per_request_count', route='titles-list'
+        ) > 0
+
+    def test_response_cache_metrics(self, client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        hits = get_value('yamdb_response_cache_requests_total', result='hit')
+        client.get(url)
+        client.get(url)
+
+        assert get_value(
+            'yamdb_response_cache_requests_total', result='hit'
+        ) == hits + 1, 'Проверьте, что попадания в кэш ответов считаются'
+
+    def test_endpoint(self, client, title):
+        client.get(f'/api/v1/titles/{title.id}/')
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert 'route="titles-detail"' in response.content.decode()
+        assert client.post('/metrics').status_code == 405
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_chain(title):
+    labels = {'route': 'async-titles-list', 'method': 'GET'}
+    before = get_value('yamdb_http_requests_total', status='200', **labels)
+    queries = get_value(
+        'yamdb_db_queries_per_request_sum', route='async-titles-list'
+    )
+    async_to_sync(async_get)('/api/v1/async/titles/')
+
+    assert get_value(
+        'yamdb_http_requests_total', status='200', **labels
+    ) == before + 1
+    assert get_value(
+        'yamdb_db_queries_per_request_sum', route='async-titles-list'
+    ) > queries, (
+        'Проверьте, что считаются запросы асинхронных эндпоинтов, '
+        'выполненные в других потоках'
+    )
+
+
+async def async_get(url):
+    return await AsyncClient().get(url)
+
+
+def test_multiprocess(tmp_path, monkeypatch):
+    env = {
+        **os.environ,
+        'PROMETHEUS_MULTIPROC_DIR': str(tmp_path),
+        'PYTHONPATH': str(settings.BASE_DIR),
+    }
+    for _ in range(2):
+        subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                'from core.metrics import record_import; '
+                'record_import("import", "Title", 5, 0.5)',
+            ],
+            env=env,
+            check=True,
+        )
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    content = render_metrics()[0].decode()
+
+    assert (
+        'yamdb_import_rows_total{command="import",model="Title"} 10.0'
+        in content
+    ), 'Проверьте, что метрики процессов складываются'
+
+
+def test_missing_multiproc_dir(tmp_path):
+    path = tmp_path / 'prometheus'
+    subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'from core.metrics import record_import; '
+            'record_import("import", "Title", 5, 0.5)',
+        ],
+        env={
+            **os.environ,
+            'PROMETHEUS_MULTIPROC_DIR': str(path),
+            'PYTHONPATH': str(settings.BASE_DIR),
+        },
+        check=True,
+    )
+    assert list(path.glob('*.db')), (
+        'Проверьте, что метрики пишутся, даже если каталог '
+        'PROMETHEUS_MULTIPROC_DIR ещё не создан'
+    )
@@ -0,0 +1,76 @@
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+PROFILING_MIDDLEWARE = 'core.middleware.ProfilingMiddleware'
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.MIDDLEWARE = [PROFILING_MIDDLEWARE, *settings.MIDDLEWARE]
+    settings.PROFILING_SAMPLE_RATE = 0
+    return settings
+
+
+def get_timings(response):
+    assert 'Server-Timing' in response, (
+        'Проверьте, что ответ содержит заголовок Server-Timing'
+    )
+    return {
+        metric.split(';')[0].strip(): metric
+        for metric in response['Server-Timing'].split(',')
+    }
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+
+    def test_server_timing(self, profiling, user_client, title):
+        timings = get_timings(user_client.get(f'/api/v1/titles/{title.id}/'))
+
+        assert {'db', 'auth', 'serialize', 'render', 'total'} <= set(
+            timings
+        )
+        assert 'queries' in timings['db']
+
+    def test_sampled_log(self, profiling, client, title, caplog):
+        profiling.PROFILING_SAMPLE_RATE = 1
+        with caplog.at_level(logging.INFO, logger='yamdb.profiling'):
+            client.get('/api/v1/titles/')
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['route'] == 'api:titles-list'
+        assert record['status'] == 200
+        assert record['queries'] >= 1 and record['total_ms'] > 0
+
+    def test_cprofile_of_slow_requests(self, profiling, client, tmp_path):
+        profiling.DEBUG = True
+        profiling.PROFILING_CPROFILE_THRESHOLD = 0
+        profiling.PROFILING_CPROFILE_DIR = str(tmp_path)
+        client.get('/api/v1/genres/')
+
+        assert list(tmp_path.glob('*-GET-api-v1-genres.prof')), (
+            'Проверьте, что медленные запросы профилируются в DEBUG'
+        )
+
+    def test_disabled_by_default(self, client):
+        assert 'Server-Timing' not in client.get('/api/v1/genres/')
+
+
+@async_to_sync
+async def async_get(url):
+    return await AsyncClient().get(url)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_chain(profiling, title):
+    timings = get_timings(async_get('/api/v1/async/titles/'))
+
+    assert 'serialize' in timings
+    assert '"0 queries"' not in timings['db'], (
+        'Проверьте, что профиль видит запросы асинхронных эндпоинтов, '
+        'выполненные в других потоках'
+    )
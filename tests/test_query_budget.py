@@ -0,0 +1,142 @@
+import pytest
+from django.db import IntegrityError
+
+from api.pagination import PubDateCursorPagination
+from reviews.models import Comment, Genre, Review, Title
+
+from .utils import assert_max_queries
+
+
+def create_content(category, genres, author, size):
+    for i in range(size):
+        title = Title.objects.create(
+            name=f'Тайтл {i}', year=2000, description='', category=category
+        )
+        title.genre.set(genres)
+    title = Title.objects.first()
+    review = Review.objects.create(
+        title=title, author=author, text='Отзыв', score=5
+    )
+    for user in type(author).objects.exclude(pk=author.pk)[:size]:
+        Review.objects.create(title=title, author=user, text='', score=1)
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text=f'Комментарий {i}')
+        for i in range(size)
+    )
+    return title, review
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+
+    @pytest.mark.parametrize('size', (2, 20))
+    def test_read_endpoints(
+        self, client, admin_client, admin, category, django_user_model, size
+    ):
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{i}', email=f'{i}@yamdb.fake')
+            for i in range(size)
+        )
+        genres = [
+            Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+            for i in range(3)
+        ]
+        title, review = create_content(category, genres, admin, size)
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+
+        assert_max_queries(client, '/api/v1/titles/', 3)
+        assert_max_queries(client, f'/api/v1/titles/{title.id}/', 2)
+        assert_max_queries(client, '/api/v1/genres/', 2)
+        assert_max_queries(client, '/api/v1/categories/', 2)
+        assert_max_queries(client, reviews_url, 3)
+        assert_max_queries(client, f'{reviews_url}{review.id}/comments/', 3)
+        assert_max_queries(admin_client, '/api/v1/users/', 3)
+        assert_max_queries(admin_client, '/api/v1/users/me/', 1)
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_cursor_pages(
+        self, client, title, django_user_model, monkeypatch
+    ):
+        monkeypatch.setattr(PubDateCursorPagination, 'page_size', 2)
+        for i in range(5):
+            author = django_user_model.objects.create(
+                username=f'user{i}', email=f'{i}@yamdb.fake'
+            )
+            Review.objects.create(title=title, author=author, text='', score=1)
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+
+        seen = []
+        while url:
+            assert_max_queries(client, url, 2)
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает записи'
+            )
+            assert 'pagination=cursor' in (data['next'] or url)
+            seen.extend(review['id'] for review in data['results'])
+            url = data['next']
+
+        assert seen == sorted(seen) and len(set(seen)) == 5
+
+
+@pytest.mark.django_db
+class TestNestedWrites:
+
+    def test_review_create(
+        self, user_client, user, title, django_assert_max_num_queries
+    ):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.get('/api/v1/users/me/')
+
+        # Отзыв, пересчёт рейтинга тайтла и его оценок в рейтингах лучших.
+        with django_assert_max_num_queries(6):
+            response = user_client.post(url, data={'text': 'Да', 'score': 9})
+        assert response.status_code == 201
+
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение отклоняется'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Review already exists']
+        }
+        assert Review.objects.filter(title=title, author=user).count() == 1
+
+    def test_other_integrity_errors_are_not_duplicates(
+        self, user_client, title, monkeypatch
+    ):
+        def fail(self, *args, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(Review, 'save', fail)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Да', 'score': 9},
+            )
+
+    def test_comment_requires_matching_title(
+        self, user_client, admin, title, category
+    ):
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        other = Title.objects.create(name='Другой', year=2000, category=category)
+
+        response = user_client.post(
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/',
+            data={'text': 'Комментарий'},
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв ищется только среди отзывов произведения '
+            'из URL'
+        )
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            data={'text': 'Комментарий'},
+        )
+        assert response.status_code == 201
+        assert not Comment.objects.exclude(review=review).exists()
@@ -0,0 +1,76 @@
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRating:
+
+    def get_rating(self, title):
+        title.refresh_from_db()
+        return title.rating_sum, title.rating_count
+
+    def test_rating_follows_reviews(self, title, user, another_user):
+        review = Review.objects.create(
+            title=title, author=user, text='Текст', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Текст', score=5
+        )
+        assert self.get_rating(title) == (15, 2), (
+            'Проверьте, что создание отзыва обновляет рейтинг тайтла'
+        )
+
+        review = Review.objects.get(pk=review.pk)
+        review.score = 1
+        review.save()
+        assert self.get_rating(title) == (6, 2), (
+            'Проверьте, что изменение оценки обновляет рейтинг тайтла'
+        )
+
+        review.delete()
+        assert self.get_rating(title) == (5, 1), (
+            'Проверьте, что удаление отзыва обновляет рейтинг тайтла'
+        )
+
+        another_user.delete()
+        assert self.get_rating(title) == (0, 0), (
+            'Проверьте, что каскадное удаление отзывов обновляет рейтинг'
+        )
+        assert title.rating is None
+
+    def test_stale_instances(self, title, user):
+        review = Review.objects.create(
+            title=title, author=user, text='Текст', score=10
+        )
+        first = Review.objects.get(pk=review.pk)
+        second = Review.objects.get(pk=review.pk)
+        first.score = 1
+        first.save()
+        second.score = 3
+        second.save()
+        assert self.get_rating(title) == (3, 1), (
+            'Проверьте, что изменение оценки считается от значения в базе, '
+            'а не от загруженного в объект'
+        )
+
+        first.delete()
+        assert self.get_rating(title) == (0, 0)
+
+    def test_rebuild_ratings(self, title, user):
+        Review.objects.bulk_create(
+            [Review(title=title, author=user, text='Текст', score=7)]
+        )
+        assert self.get_rating(title) == (0, 0)
+
+        Title.objects.all().rebuild_ratings()
+        assert self.get_rating(title) == (7, 1), (
+            'Проверьте, что пересчёт рейтинга учитывает все отзывы'
+        )
+
+    def test_rating_in_api(self, client, title, user):
+        Review.objects.create(title=title, author=user, text='Т', score=8)
+
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] == 8
@@ -0,0 +1,69 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import ORJSONRenderer
+
+
+class TestORJSONRenderer:
+
+    def test_matches_json_renderer(self):
+        data = {
+            'text': 'Строка с разделителем',
+            'score': Decimal('7.5'),
+            1: None,
+        }
+
+        assert json.loads(ORJSONRenderer().render(data)) == json.loads(
+            JSONRenderer().render(data)
+        )
+        assert b'\\u2028' in ORJSONRenderer().render(data)
+
+    def test_datetime(self):
+        pub_date = datetime(2023, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+        assert ORJSONRenderer().render({'pub_date': pub_date}) == (
+            b'{"pub_date":"2023-03-01T12:30:00Z"}'
+        ), 'Проверьте, что даты сериализуются в ISO 8601'
+
+
+@pytest.mark.django_db
+class TestJSONApi:
+
+    def test_title_list(self, client, title):
+        response = client.get('/api/v1/titles/')
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.json()['results'][0]['id'] == title.id
+
+    def test_indent(self, client, title):
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT='application/json; indent=2'
+        )
+
+        assert b'\n  "count"' in response.content
+
+    def test_no_browsable_api(self, client):
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT='text/html')
+
+        assert response.status_code == 406, (
+            'Проверьте, что без DEBUG браузерный API отключён'
+        )
+
+    def test_parse(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(
+            url,
+            '{"text": "Текст", "score": 7}',
+            content_type='application/json',
+        )
+        assert response.status_code == 201
+
+        response = user_client.post(
+            url, '{"text": ', content_type='application/json'
+        )
+        assert response.status_code == 400
+        assert 'JSON parse error' in response.json()['detail']
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.db.routers import ReplicaRouter, may_be_stale, read_replica
+from core.middleware import ReplicaMiddleware
+from reviews.models import Title
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = REPLICAS
+    settings.REPLICA_PIN_SECONDS = 5
+
+
+def run_middleware(request, status=200):
+    seen = []
+
+    def get_response(request):
+        seen.append(ReplicaRouter().db_for_read(Title))
+        return HttpResponse(status=status)
+
+    ReplicaMiddleware(get_response)(request)
+    return seen[0]
+
+
+def run_async_middleware(request, status=200):
+    seen = []
+
+    async def get_response(request):
+        seen.append(ReplicaRouter().db_for_read(Title))
+        return HttpResponse(status=status)
+
+    middleware = ReplicaMiddleware(get_response)
+    assert asyncio.iscoroutinefunction(middleware), (
+        'Проверьте, что в асинхронной цепочке ReplicaMiddleware '
+        'работает без sync_to_async'
+    )
+    async_to_sync(middleware)(request)
+    return seen[0]
+
+
+class TestReplicaRouter:
+
+    def test_routing(self, replicas):
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) == 'default'
+
+        token = read_replica.set('replica_2')
+        try:
+            assert router.db_for_read(Title) == 'replica_2'
+            assert router.db_for_write(Title) == 'default'
+        finally:
+            read_replica.reset(token)
+        assert not router.allow_migrate('replica_1', 'reviews')
+        assert router.allow_migrate('default', 'reviews')
+
+    def test_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert run_middleware(RequestFactory().get('/')) == 'default'
+
+    def test_recent_versions_may_be_stale(self, replicas):
+        token = read_replica.set('replica_2')
+        try:
+            assert may_be_stale(time.time_ns())
+            assert not may_be_stale(time.time_ns() - 60 * 10 ** 9)
+        finally:
+            read_replica.reset(token)
+        assert not may_be_stale(time.time_ns())
+
+
+@pytest.mark.usefixtures('replicas')
+class TestReplicaMiddleware:
+    factory = RequestFactory()
+
+    def test_reads_go_to_replicas(self):
+        assert run_middleware(self.factory.get('/')) in REPLICAS
+        assert run_middleware(self.factory.post('/')) == 'default'
+
+    def test_client_is_pinned_after_write(self):
+        auth = {'HTTP_AUTHORIZATION': 'Bearer writer'}
+        run_middleware(self.factory.post('/', **auth), status=201)
+
+        assert run_middleware(self.factory.get('/', **auth)) == 'default', (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+        other = {'HTTP_AUTHORIZATION': 'Bearer reader'}
+        assert run_middleware(self.factory.get('/', **other)) in REPLICAS
+
+    def test_failed_write_does_not_pin(self):
+        auth = {'HTTP_AUTHORIZATION': 'Bearer writer'}
+        run_middleware(self.factory.post('/', **auth), status=400)
+        assert run_middleware(self.factory.get('/', **auth)) in REPLICAS
+
+    def test_async_chain(self):
+        auth = {'HTTP_AUTHORIZATION': 'Bearer writer'}
+        assert run_async_middleware(self.factory.get('/', **auth)) in REPLICAS
+        run_async_middleware(self.factory.post('/', **auth), status=201)
+
+        assert run_middleware(self.factory.get('/', **auth)) == 'default', (
+            'Проверьте, что запись в асинхронной цепочке закрепляет клиента '
+            'за основной базой'
+        )
@@ -0,0 +1,73 @@
+import pytest
+
+from reviews.models import Title
+
+from .utils import assert_max_queries
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_search(self, client, title, category):
+        Title.objects.create(
+            name='Крестный отец',
+            year=1972,
+            description='Побег не удался',
+            category=category,
+        )
+
+        response = client.get('/api/v1/titles/', {'search': 'Побег'})
+        assert response.status_code == 200
+        names = [item['name'] for item in response.json()['results']]
+        assert names == ['Побег из Шоушенка', 'Крестный отец'], (
+            'Проверьте, что поиск находит тайтлы по названию и описанию '
+            'и ставит совпадения в названии выше'
+        )
+
+        response = client.get('/api/v1/titles/', {'search': 'Шоушенк Побег'})
+        assert response.json()['count'] == 1
+
+
+@pytest.mark.django_db
+class TestTitleFacets:
+
+    def test_genre_filters_and_facets(self, client, title, category, genres):
+        drama, comedy = genres
+        other = Title.objects.create(
+            name='Крестный отец', year=1972, description='', category=category
+        )
+        other.genre.set([drama])
+
+        def names(**params):
+            response = client.get('/api/v1/titles/', params)
+            assert response.status_code == 200
+            return sorted(item['name'] for item in response.json()['results'])
+
+        assert names(genre='drama') == ['Крестный отец', 'Побег из Шоушенка']
+        assert names(genre='dram') == [], (
+            'Проверьте, что жанр фильтруется по точному слагу'
+        )
+        assert names(genre='drama,comedy', genre_mode='all') == [
+            'Побег из Шоушенка'
+        ]
+        assert names(year_min=1980, year_max=2000) == ['Побег из Шоушенка']
+
+        facets = client.get(
+            '/api/v1/titles/', {'genre': 'drama', 'facets': 'true'}
+        ).json()['facets']
+        assert facets == {
+            'genre': {'drama': 2, 'comedy': 1},
+            'category': {'movie': 2},
+            'year': {'1972': 1, '1994': 1},
+        }
+
+        title.genre.remove(comedy)
+        facets = client.get(
+            '/api/v1/titles/', {'facets': 'true'}
+        ).json()['facets']
+        assert facets['genre'] == {'drama': 2}, (
+            'Проверьте, что фасеты обновляются после изменения жанров'
+        )
+        assert_max_queries(
+            client, '/api/v1/titles/?genre=drama&search=Побег&facets=true', 6
+        )
@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Запрос к `{url}` вернул статус {response.status_code}'
+    )
+    queries = [query['sql'] for query in context.captured_queries]
+    return response.json(), queries
+
+
+@pytest.fixture
+def review(title, user):
+    return Review.objects.create(
+        title=title, author=user, text='Отзыв', score=8
+    )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def test_title_fields(self, client, title):
+        data, queries = get_with_queries(
+            client, '/api/v1/titles/?fields=id,name,rating'
+        )
+
+        assert data['results'] == [
+            {'id': title.id, 'name': title.name, 'rating': None}
+        ], 'Проверьте, что ?fields= оставляет в ответе только эти поля'
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что ненужные поля не читаются из базы'
+        )
+        assert not any(
+            'reviews_genre' in sql or 'reviews_category' in sql
+            for sql in queries
+        ), 'Проверьте, что связи не загружаются без их полей'
+
+    def test_title_nested_fields(self, client, title):
+        data, queries = get_with_queries(
+            client, f'/api/v1/titles/{title.id}/?fields=genre,category'
+        )
+
+        assert data == {
+            'genre': [
+                {'name': 'Драма', 'slug': 'drama'},
+                {'name': 'Комедия', 'slug': 'comedy'},
+            ],
+            'category': {'name': 'Фильм', 'slug': 'movie'},
+        }
+        assert not any('"description"' in sql for sql in queries)
+
+    def test_default_fields(self, client, title):
+        data = client.get(f'/api/v1/titles/{title.id}/').json()
+
+        assert set(data) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        }
+
+    def test_expand_author(self, client, title, review):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data, queries = get_with_queries(
+            client, f'{url}?fields=id,author&expand=author'
+        )
+
+        assert data['results'] == [{
+            'id': review.id,
+            'author': {
+                'username': review.author.username,
+                'first_name': '',
+                'last_name': '',
+                'bio': '',
+            },
+        }], 'Проверьте, что ?expand=author раскрывает автора'
+        assert not any('"text"' in sql for sql in queries)
+        assert client.get(url).json()['results'][0]['author'] == (
+            review.author.username
+        )
+
+    def test_user_fields(self, admin_client, user):
+        data, queries = get_with_queries(
+            admin_client, f'/api/v1/users/{user.username}/?fields=email'
+        )
+
+        assert data == {'email': user.email}
+        assert '"bio"' not in queries[-1]
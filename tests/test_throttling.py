@@ -0,0 +1,85 @@
+import multiprocessing
+
+import pytest
+
+from core import throttling
+
+TOKEN_URL = '/api/v1/auth/token/'
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+def take_tokens(key, count, queue):
+    queue.put(sum(
+        throttling.take_token(key, 100, 0.001) is None for _ in range(count)
+    ))
+
+
+class TestTokenBucket:
+
+    def test_refill(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr(throttling.time, 'time', lambda: now)
+        results = [throttling.take_token('refill', 2, 0.5) for _ in range(3)]
+
+        assert results[:2] == [None, None]
+        assert results[2] == pytest.approx(2)
+        now += 2
+        assert throttling.take_token('refill', 2, 0.5) is None, (
+            'Проверьте, что бакет наполняется со временем'
+        )
+        assert throttling.take_token('refill', 2, 0.5) is not None
+
+    def test_shared_between_processes(self):
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        processes = [
+            context.Process(target=take_tokens, args=('shared', 50, queue))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        granted = sum(queue.get(timeout=10) for _ in processes)
+        for process in processes:
+            process.join()
+
+        assert granted == 100, (
+            'Проверьте, что процессы списывают токены из общего бакета'
+        )
+
+
+@pytest.mark.django_db
+class TestAuthThrottling:
+
+    def test_token_per_username(self, client, user, settings):
+        settings.THROTTLE_RATES = {'get_jwt.username': '2/minute'}
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            assert client.post(TOKEN_URL, data).status_code == 400
+        response = client.post(TOKEN_URL, data)
+
+        assert response.status_code == 429, (
+            'Проверьте, что подбор кода для одного пользователя ограничен'
+        )
+        assert int(response['Retry-After']) > 0
+        assert client.post(
+            TOKEN_URL, {**data, 'username': 'another'}
+        ).status_code == 404
+
+    def test_signup_per_ip(self, client, settings):
+        settings.THROTTLE_RATES = {'signup.ip': '2/hour'}
+        for i in range(2):
+            response = client.post(
+                SIGNUP_URL,
+                {'username': f'flood-{i}', 'email': f'flood-{i}@yamdb.fake'},
+            )
+            assert response.status_code == 200
+        response = client.post(
+            SIGNUP_URL,
+            {'username': 'flood-2', 'email': 'flood-2@yamdb.fake'},
+            REMOTE_ADDR='10.0.0.1',
+        )
+        assert response.status_code == 200
+
+        assert client.post(
+            SIGNUP_URL, {'username': 'flood-3', 'email': 'flood-3@yamdb.fake'}
+        ).status_code == 429, 'Проверьте, что регистрации с IP ограничены'
@@ -0,0 +1,18 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_max_queries(client, url, max_queries):
+    """Проверяет, что GET-запрос к `url` укладывается в бюджет SQL-запросов."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Запрос к `{url}` вернул статус {response.status_code}'
+    )
+    queries = len(context.captured_queries)
+    assert queries <= max_queries, (
+        f'Запрос к `{url}` выполнил {queries} SQL-запросов, '
+        f'допустимо не больше {max_queries}:\n'
+        + '\n'.join(query['sql'] for query in context.captured_queries)
+    )
+    return queries